@@ -1,14 +1,32 @@
 import pandas as pd
 import numpy as np
+import csv
 import json
 import os
+import hashlib
 import logging
-from typing import Any, Dict, Union
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple, Union
 from pathlib import Path, PureWindowsPath  # Importiere pathlib
 
 # Konfiguriere das Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Version des Ladeformats; eine Erhöhung invalidiert alle Einträge im Cache
+LOADER_VERSION = 1
+
+# Abtastrate der Rohdaten
+SAMPLING_RATE_HZ = 10e3  # 10 kHz
+# Speicherbedarf eines Samples im zusammengesetzten DataFrame: 'time' und 'data' (float64)
+# sowie je ein Objektverweis für 'experiment' und 'measurement'
+BYTES_PER_SAMPLE = 32
+
+# Standard-Trennzeichen je Dateityp, falls das Sniffing kein eindeutiges Ergebnis liefert
+DEFAULT_SEPARATORS = {'csv': ',', 'tsv': '\t'}
+# Zahl mit Dezimalkomma, z.B. -1,234
+DECIMAL_COMMA_PATTERN = re.compile(r'^-?\d+,\d+(?:[eE][-+]?\d+)?$')
+
 class DataLoader:
     """
     DataLoader Klasse zum Laden und Vereinigen von Datensätzen für verschiedene Experimente.
@@ -21,6 +39,7 @@ class DataLoader:
             with open(config_path, 'r') as config_file:
                 self.config = json.load(config_file)
             self.validate_config()
+            self.loading_config = self.config.get('data_loading', {})
             logging.info("Konfiguration erfolgreich geladen und validiert.")
         except FileNotFoundError:
             logging.error(f"Konfigurationsdatei unter {config_path} nicht gefunden.")
@@ -38,57 +57,269 @@ class DataLoader:
             if field not in self.config:
                 raise ValueError(f"Fehlendes erforderliches Feld in der Konfiguration: {field}")
 
-    def load_experiment_data(self, experiment_name: Union[str, None] = None) -> pd.DataFrame:
+    def load_experiment_data(self, experiment_name: Union[str, None] = None, n_workers: Union[int, None] = None,
+                             compact: Union[bool, None] = None, data_dtype: Union[str, None] = None) -> pd.DataFrame:
         """
         Lädt Datensätze für ein gegebenes Experiment oder alle Experimente.
+
+        Die Dateien werden bei n_workers > 1 parallel eingelesen (CSV/TSV in einem Prozesspool,
+        Pickle-Dateien und Cache-Lesezugriffe in einem Threadpool). Die Reihenfolge der Messungen
+        entspricht immer der Reihenfolge in der Konfiguration. Das Ergebnis wird direkt in
+        vorab allokierte Arrays geschrieben und enthält die Spalten 'time', 'data',
+        'experiment' und 'measurement'.
+
+        Im kompakten Modus (compact=True) sind 'experiment' und 'measurement' kategorial und die
+        Spalte 'time' entfällt; sie kann bei Bedarf mit time_axis() aus dem Index abgeleitet werden.
+        Mit data_dtype='float32' werden die Messwerte zusätzlich in einfacher Genauigkeit gehalten.
+        """
+        n_workers = n_workers or self.loading_config.get('n_workers', 1)
+        compact = self.loading_config.get('compact', False) if compact is None else compact
+        data_dtype = data_dtype or self.loading_config.get('data_dtype', 'float64')
+        measurements = self.load_measurement_values(self.file_tasks(experiment_name), n_workers)
+
+        if not measurements:
+            logging.warning(f"Keine Daten für Experiment(e) geladen.")
+            return pd.DataFrame()
+        data = self.assemble_measurements(measurements, n_workers, compact=compact, data_dtype=data_dtype)
+        if compact or logging.getLogger().isEnabledFor(logging.DEBUG):
+            # memory_usage(deep=True) durchläuft bei Objektspalten jede einzelne Zeichenkette
+            logging.info(f"{len(data)} Samples geladen, Speicherbedarf: {self.bytes_per_sample(data):.1f} Bytes/Sample.")
+        else:
+            logging.info(f"{len(data)} Samples geladen.")
+        return data
+
+    def iter_measurements(self, experiment_name: Union[str, None] = None) -> Iterator[Tuple[str, str, pd.DataFrame]]:
+        """
+        Lädt die Messungen nacheinander und liefert (experiment, measurement, DataFrame).
+        Es wird immer nur eine Messung im Speicher gehalten; die Spalten entsprechen
+        load_experiment_data, die Zeitachse läuft über alle Messungen weiter.
+        """
+        first_sample = 0
+        for task in self.file_tasks(experiment_name):
+            for experiment, measurement, values in self.load_measurement_values([task]):
+                yield experiment, measurement, self.assemble_measurements([(experiment, measurement, values)], first_sample=first_sample)
+                first_sample += len(values)
+
+    def iter_chunks(self, chunk_samples: Union[int, None] = None, max_memory_bytes: Union[int, None] = None,
+                    experiment_name: Union[str, None] = None) -> Iterator[Tuple[str, str, pd.DataFrame]]:
+        """
+        Liefert die Messungen in Blöcken fester Länge als (experiment, measurement, DataFrame).
+        Ein Block gehört immer zu genau einer Messung; der letzte Block einer Messung kann kürzer sein.
+
+        Die Blockgröße ergibt sich aus chunk_samples oder aus der Speichergrenze max_memory_bytes
+        (Standard aus config.json["data_loading"]["chunk_samples"]). Bei aktiviertem Cache werden
+        die Blöcke direkt aus der speicherabgebildeten Datei gelesen, sodass der Speicherbedarf
+        durch die Blockgröße begrenzt ist; ohne Cache muss jede Messung einmal vollständig geparst werden.
+        """
+        if chunk_samples is None and max_memory_bytes is not None:
+            chunk_samples = max(1, max_memory_bytes // BYTES_PER_SAMPLE)
+        chunk_samples = chunk_samples or self.loading_config.get('chunk_samples', 1_000_000)
+
+        first_sample = 0
+        for task in self.file_tasks(experiment_name):
+            for experiment, measurement, values in self.load_measurement_values([task]):
+                for start in range(0, len(values), chunk_samples):
+                    chunk = values[start:start + chunk_samples]
+                    yield experiment, measurement, self.assemble_measurements([(experiment, measurement, chunk)], first_sample=first_sample + start)
+                first_sample += len(values)
+
+    def file_tasks(self, experiment_name: Union[str, None] = None) -> List[Tuple[Path, str, str]]:
+        """
+        Liefert (Pfad, Dateityp, Experiment) für alle zu ladenden Dateien in Konfigurationsreihenfolge.
         """
         if experiment_name and experiment_name not in self.config['experiments']:
             raise ValueError(f"Experiment {experiment_name} nicht in der Konfiguration gefunden.")
 
-        experiment_data = []
         experiments_to_load = self.config['experiments'] if not experiment_name else {experiment_name: self.config['experiments'][experiment_name]}
-
+        tasks = []
         for experiment, files in experiments_to_load.items():
             for file_info in files:
                 # Konvertiere Windows-Pfad zu einem systemunabhängigen Path-Objekt
                 file_path = Path(PureWindowsPath(file_info['path']))
-                file_type = file_info['type']
+                tasks.append((file_path, file_info['type'], experiment))
+        return tasks
+
+    def load_measurement_values(self, tasks: List[Tuple[Path, str, str]], n_workers: int = 1) -> List[Tuple[str, str, np.ndarray]]:
+        """
+        Lädt die Messwerte aller Dateien und liefert (experiment, measurement, values) in der
+        Reihenfolge der Aufgaben. Fehlerhafte Dateien werden protokolliert und übersprungen.
+        """
+        # Nur Dateien ohne gültigen Cache-Eintrag müssen geparst werden
+        cached = {}
+        to_parse = []
+        for index, (file_path, file_type, experiment) in enumerate(tasks):
+            cache_path = self.cache_path(file_path, experiment)
+            values = None
+            if cache_path is not None and os.path.exists(file_path):
+                values = self.read_cache(file_path, cache_path)
+            if values is not None:
+                cached[index] = values
+            else:
+                to_parse.append(index)
+
+        parsed = {}
+        if n_workers > 1 and to_parse:
+            # Textdateien sind durch das Parsen CPU-gebunden, Pickle-Dateien durch I/O
+            process_indices = [index for index in to_parse if tasks[index][1] in DEFAULT_SEPARATORS]
+            thread_indices = [index for index in to_parse if tasks[index][1] not in DEFAULT_SEPARATORS]
+            with ProcessPoolExecutor(max_workers=n_workers) as process_pool, \
+                    ThreadPoolExecutor(max_workers=n_workers) as thread_pool:
+                futures = {index: process_pool.submit(self.parse_values, *tasks[index]) for index in process_indices}
+                futures.update({index: thread_pool.submit(self.parse_values, *tasks[index]) for index in thread_indices})
+                for index in to_parse:
+                    try:
+                        parsed[index] = futures[index].result()
+                    except Exception as e:
+                        logging.error(f"Fehler beim Laden der Datei {tasks[index][0]}: {e}")
+        else:
+            for index in to_parse:
                 try:
-                    data = self.load_file(file_path, file_type, experiment)
-                    file_name = file_path.name.split('.')[0]
-                    
-                    # Füge 'experiment' und 'measurement' Spalten hinzu
-                    data['experiment'] = experiment
-                    data['measurement'] = file_name
-
-                    # Behalte 'time', 'experiment', und 'measurement' als reguläre Spalten
-                    experiment_data.append(data)
+                    parsed[index] = self.parse_values(*tasks[index])
                 except Exception as e:
-                    logging.error(f"Fehler beim Laden der Datei {file_path}: {e}")
-                    continue
-        
-        if not experiment_data:
-            logging.warning(f"Keine Daten für Experiment(e) geladen.")
-            return pd.DataFrame()
-        # Verbinde Daten wie sie sind, ohne den Index zu ändern
-        data = pd.concat(experiment_data, ignore_index=True)
+                    logging.error(f"Fehler beim Laden der Datei {tasks[index][0]}: {e}")
+
+        measurements = []
+        for index, (file_path, file_type, experiment) in enumerate(tasks):
+            if index in cached:
+                values = cached[index]
+            elif index in parsed:
+                values = parsed.pop(index)
+                if values is None:
+                    # Der Worker hat die Werte in den Cache geschrieben
+                    values = self.read_cache(file_path, self.cache_path(file_path, experiment))
+            else:
+                continue
+            measurements.append((experiment, file_path.name.split('.')[0], values))
+        return measurements
+
+    def parse_values(self, file_path: Path, file_type: str, experiment_name: str) -> Union[np.ndarray, None]:
+        """
+        Parst eine Datei und liefert die Messwerte. Ist der Cache aktiviert, werden die Werte
+        stattdessen in den Cache geschrieben und None zurückgegeben, damit sie nicht zwischen
+        Prozessen kopiert werden müssen.
+        """
+        values = self.parse_file(file_path, file_type, experiment_name)['data'].to_numpy()
+        cache_path = self.cache_path(file_path, experiment_name)
+        if cache_path is None:
+            return values
+        self.write_cache(file_path, cache_path, values)
+        return None
+
+    def assemble_measurements(self, measurements: List[Tuple[str, str, np.ndarray]], n_workers: int = 1,
+                              first_sample: int = 0, compact: bool = False, data_dtype: str = 'float64') -> pd.DataFrame:
+        """
+        Vereinigt die Messwerte in einem DataFrame. Die Spalten werden einmalig in voller Länge
+        allokiert und abschnittsweise befüllt, sodass keine Einzel-DataFrames und keine
+        zusätzliche Kopie durch pd.concat entstehen. first_sample verschiebt die Zeitachse,
+        wenn nur ein Ausschnitt der Gesamtdaten zusammengesetzt wird.
+
+        Die Messwerte in measurements werden direkt nach dem Kopieren freigegeben (der Eintrag
+        wird durch (experiment, measurement, None) ersetzt), sodass der Spitzenspeicherbedarf
+        nicht aus allen Einzel-Arrays plus dem Gesamt-Array besteht.
+        """
+        lengths = [len(values) for _, _, values in measurements]
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        total_samples = int(offsets[-1])
+
+        data = np.empty(total_samples, dtype=data_dtype)
+        if compact:
+            # Kategorien in Reihenfolge des ersten Auftretens; pro Sample wird nur ein Code gespeichert
+            experiment_categories = list(dict.fromkeys(experiment for experiment, _, _ in measurements))
+            measurement_categories = list(dict.fromkeys(measurement for _, measurement, _ in measurements))
+            experiments = np.empty(total_samples, dtype=self.category_code_dtype(experiment_categories))
+            measurement_names = np.empty(total_samples, dtype=self.category_code_dtype(measurement_categories))
+            experiment_labels = {name: code for code, name in enumerate(experiment_categories)}
+            measurement_labels = {name: code for code, name in enumerate(measurement_categories)}
+        else:
+            experiments = np.empty(total_samples, dtype=object)
+            measurement_names = np.empty(total_samples, dtype=object)
+
+        def fill(index):
+            experiment, measurement, values = measurements[index]
+            start, stop = offsets[index], offsets[index + 1]
+            data[start:stop] = values
+            experiments[start:stop] = experiment_labels[experiment] if compact else experiment
+            measurement_names[start:stop] = measurement_labels[measurement] if compact else measurement
+            measurements[index] = (experiment, measurement, None)
+
+        if n_workers > 1:
+            # Das Kopieren aus speicherabgebildeten Cache-Dateien ist I/O-gebunden
+            with ThreadPoolExecutor(max_workers=n_workers) as thread_pool:
+                list(thread_pool.map(fill, range(len(measurements))))
+        else:
+            for index in range(len(measurements)):
+                fill(index)
+
+        if compact:
+            # Die Zeitachse steckt implizit im Index, siehe time_axis()
+            return pd.DataFrame({
+                'data': data,
+                'experiment': pd.Categorical.from_codes(experiments, categories=experiment_categories),
+                'measurement': pd.Categorical.from_codes(measurement_names, categories=measurement_categories),
+            }, index=pd.RangeIndex(first_sample, first_sample + total_samples), copy=False)
+
         # Erzeuge einen Zeitindex in Sekunden
-        actual_number_of_samples = len(data)
-        sampling_rate = 10e3  # 10 kHz
-        time_in_seconds = np.arange(1, actual_number_of_samples + 1) / sampling_rate
-        data['time'] = time_in_seconds  # Füge Zeit-Spalte hinzu, aber nicht als Index
-        return data
+        time_in_seconds = np.arange(first_sample + 1, first_sample + total_samples + 1) / SAMPLING_RATE_HZ
+        return pd.DataFrame({
+            'time': time_in_seconds,
+            'data': data,
+            'experiment': experiments,
+            'measurement': measurement_names,
+        }, copy=False)
 
+    @staticmethod
+    def category_code_dtype(categories: List[str]) -> np.dtype:
+        """
+        Kleinster vorzeichenbehafteter Ganzzahltyp für die Codes der gegebenen Kategorien.
+        """
+        return np.min_scalar_type(-len(categories))
+
+    @staticmethod
+    def time_axis(data: pd.DataFrame) -> np.ndarray:
+        """
+        Liefert die Zeitachse in Sekunden. Bei kompakt geladenen Daten wird sie aus dem
+        Index abgeleitet, sonst wird die vorhandene Spalte 'time' zurückgegeben.
+        """
+        if 'time' in data.columns:
+            return data['time'].to_numpy()
+        return (data.index.to_numpy() + 1) / SAMPLING_RATE_HZ
+
+    @staticmethod
+    def bytes_per_sample(data: pd.DataFrame) -> float:
+        """
+        Speicherbedarf des DataFrames (inklusive Index und Zeichenketten) pro Sample in Bytes.
+        """
+        if len(data) == 0:
+            return 0.0
+        return data.memory_usage(index=True, deep=True).sum() / len(data)
 
     def load_file(self, file_path: Path, file_type: str, experiment_name: str) -> pd.DataFrame:
         """
-        Lädt Daten aus einer Datei basierend auf ihrem Typ.
+        Lädt die Messwertspalte 'data' aus einer Datei basierend auf ihrem Typ.
+        Ist der Cache aktiviert, wird die Quelldatei nur einmal geparst; danach
+        wird die Spalte direkt aus dem Cache gelesen. Das Ergebnis enthält in beiden
+        Fällen nur die Spalte 'data'; weitere Spalten der Quelldatei liefert parse_file.
+        """
+        cache_path = self.cache_path(file_path, experiment_name)
+        if cache_path is not None:
+            cached = self.read_cache(file_path, cache_path)
+            if cached is not None:
+                return pd.DataFrame({'data': np.array(cached)})
+
+        values = self.parse_file(file_path, file_type, experiment_name)['data'].to_numpy()
+
+        if cache_path is not None:
+            self.write_cache(file_path, cache_path, values)
+        return pd.DataFrame({'data': values})
+
+    def parse_file(self, file_path: Path, file_type: str, experiment_name: str) -> pd.DataFrame:
+        """
+        Parst eine Quelldatei basierend auf ihrem Typ.
         Ersetzt Kommas durch Punkte in numerischen Werten zur Konsistenz.
         """
-        if file_type == 'csv':
-            data = pd.read_csv(file_path, converters={'RawData': lambda x: x.replace(',', '.')})
-        elif file_type == 'tsv':
-            data = pd.read_csv(file_path, sep='\t', converters={'RawData': lambda x: x.replace(',', '.')})
+        if file_type in DEFAULT_SEPARATORS:
+            separator, decimal = self.sniff_format(file_path, file_type)
+            data = pd.read_csv(file_path, sep=separator, decimal=decimal, engine='c')
         elif file_type == 'pkl':
             data = pd.read_pickle(file_path)
         else:
@@ -105,11 +336,102 @@ class DataLoader:
             first_column = data.columns[0]
             data.rename(columns={first_column: 'data'}, inplace=True)
 
-        # Stelle sicher, dass alle numerischen Werte einen Punkt als Dezimaltrennzeichen verwenden
-        data['data'] = data['data'].astype(str).str.replace(',', '.').astype(float)
+        # Nur falls der C-Parser die Spalte nicht numerisch einlesen konnte (z.B. gemischte
+        # Dezimaltrennzeichen), werden Kommas nachträglich durch Punkte ersetzt
+        if pd.api.types.is_numeric_dtype(data['data']):
+            data['data'] = data['data'].astype(float)
+        else:
+            data['data'] = data['data'].astype(str).str.replace(',', '.').astype(float)
 
         return data
 
+    def sniff_format(self, file_path: Path, file_type: str, sample_size: int = 65536) -> Tuple[str, str]:
+        """
+        Bestimmt Spalten- und Dezimaltrennzeichen einmalig anhand des Dateianfangs,
+        damit die Datei anschließend vollständig vom C-Parser eingelesen werden kann.
+        """
+        with open(file_path, 'r', encoding='latin-1', newline='') as sample_file:
+            sample = sample_file.read(sample_size)
+        lines = [line for line in sample.splitlines() if line.strip()]
+        if len(sample) == sample_size and len(lines) > 1:
+            # Die letzte Zeile ist möglicherweise abgeschnitten
+            lines = lines[:-1]
+        lines = lines[:50]
+
+        separator = DEFAULT_SEPARATORS[file_type]
+        for candidate in ('\t', ';', ','):
+            field_counts = {len(fields) for fields in csv.reader(lines, delimiter=candidate)}
+            if len(field_counts) == 1 and field_counts.pop() > 1:
+                separator = candidate
+                break
+
+        # Felder in Anführungszeichen werden vom C-Parser ebenfalls mit Dezimalkomma gelesen
+        decimal = '.'
+        for fields in list(csv.reader(lines, delimiter=separator))[1:]:
+            if any(DECIMAL_COMMA_PATTERN.match(field.strip()) for field in fields):
+                decimal = ','
+                break
+        return separator, decimal
+
+    def cache_path(self, file_path: Path, experiment_name: str) -> Union[Path, None]:
+        """
+        Liefert den Pfad der Cache-Datei (.npy) für eine Quelldatei oder None,
+        wenn der Cache in der Konfiguration nicht aktiviert ist.
+        """
+        if not self.loading_config.get('use_cache', False):
+            return None
+        cache_directory = Path(self.loading_config.get('cache_directory', '.data/cache'))
+        source = f"{Path(file_path).resolve()}|{experiment_name}"
+        digest = hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+        return cache_directory / f"{Path(file_path).stem}_{digest}.npy"
+
+    def source_fingerprint(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Erzeugt den Schlüssel, gegen den ein Cache-Eintrag validiert wird:
+        Quellpfad, Dateigröße, Änderungszeitpunkt und Version des Laders.
+        """
+        stat = os.stat(file_path)
+        return {
+            'source': str(Path(file_path).resolve()),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'loader_version': LOADER_VERSION,
+        }
+
+    def read_cache(self, file_path: Path, cache_path: Path) -> Union[np.ndarray, None]:
+        """
+        Liest die Messwerte speicherabgebildet aus dem Cache.
+        Gibt None zurück, wenn kein gültiger Eintrag existiert oder sich die Quelldatei geändert hat.
+        """
+        meta_path = cache_path.with_suffix('.json')
+        if not cache_path.exists() or not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, 'r') as meta_file:
+                meta = json.load(meta_file)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if meta != self.source_fingerprint(file_path):
+            logging.info(f"Cache für {file_path} veraltet, Datei wird neu eingelesen.")
+            return None
+        return np.load(cache_path, mmap_mode='r')
+
+    def write_cache(self, file_path: Path, cache_path: Path, values: np.ndarray) -> None:
+        """
+        Schreibt die Messwerte als .npy-Datei samt Metadaten in den Cache.
+        Beide Dateien werden zunächst temporär geschrieben und dann atomar ersetzt.
+        """
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        meta_path = cache_path.with_suffix('.json')
+        tmp_cache_path = cache_path.with_suffix('.npy.tmp')
+        tmp_meta_path = cache_path.with_suffix('.json.tmp')
+        with open(tmp_cache_path, 'wb') as cache_file:
+            np.save(cache_file, np.ascontiguousarray(values, dtype=np.float64))
+        with open(tmp_meta_path, 'w') as meta_file:
+            json.dump(self.source_fingerprint(file_path), meta_file)
+        os.replace(tmp_cache_path, cache_path)
+        os.replace(tmp_meta_path, meta_path)
+
 # # example usage
 # # Initialisiere den DataLoader
 # data_loader = DataLoader('config.json')
@@ -5,6 +5,8 @@ import matplotlib.pyplot as plt
 from bokeh.plotting import figure, show
 from bokeh.models import HoverTool
 import seaborn as sns
+import numpy as np
+import pandas as pd
 import os
 
 
@@ -16,39 +18,81 @@ class Evaluator:
         X_test: Features from the test dataset.
         y_test: Labels from the test dataset.
         predictions: Predictions made by the model on X_test.
+        scores: Probabilities of the positive class on X_test.
+
+    Predictions and scores are computed once when the Evaluator is created and reused
+    by all metrics and plots.
 
     Methods:
+        evaluate_models(): Creates Evaluators for several models on the same test set.
+        compare(): Returns the metrics of several Evaluators as a table.
+        metrics(): Returns the evaluation metrics.
         evaluate_model(): Prints a summary of various evaluation metrics.
         plot_precision_and_recall(): Generates a plot for precision and recall curves.
         plot_metrics(): Generates ROC and Precision-Recall curves for the model.
         confusion_matrix(): Prints the confusion matrix for model predictions.
         plot_confusion_matrix(): Generates a heatmap for the confusion matrix."""
-   def __init__(self, model, X_test, y_test):
+   def __init__(self, model, X_test, y_test, predictions=None, scores=None):
       """Initializes the Evaluator with a model and test data.
 
         Args:
             model: The machine learning model to be evaluated.
             X_test: The features of the test dataset.
             y_test: The labels of the test dataset.
+            predictions: Predictions that were already made, e.g. out-of-fold predictions of a cross validation.
+                Together with scores, model and X_test are not needed.
+            scores: Positive-class probabilities belonging to predictions.
       """
       self.model = model
       self.X_test = X_test
       self.y_test = y_test
-      self.predictions = model.predict (X_test)
+      if predictions is not None and scores is not None:
+         self.predictions = predictions
+         self.scores = scores
+         return
+      # One inference pass: the predicted class is the most probable one, as in the models' own predict
+      probabilities = model.predict_proba(X_test)
+      self.predictions = model.classes_.take(np.argmax(probabilities, axis=1))
+      self.scores = probabilities[:, 1]
 
-   def evaluate_model(self):
-      """
-      Prints evaluation metrics including Accuracy, Precision, Recall, F1-Score, MCC, ROC-AUC, and PR-AUC
-      """  
-      metrics = {
+   @classmethod
+   def evaluate_models(cls, models, X_test, y_test):
+      """Evaluates several trained models against the same test set.
+
+        Args:
+            models: Trained models by name.
+            X_test: The features of the test dataset.
+            y_test: The labels of the test dataset.
+
+        Returns:
+            dict: An Evaluator per model name."""
+      return {name: cls(model, X_test, y_test) for name, model in models.items()}
+
+   @staticmethod
+   def compare(evaluators):
+      """Returns the metrics of several Evaluators as a table with one row per model.
+
+        Args:
+            evaluators: Evaluators by model name, e.g. from evaluate_models."""
+      return pd.DataFrame.from_dict({name: evaluator.metrics() for name, evaluator in evaluators.items()}, orient='index')
+
+   def metrics(self):
+      """Returns Accuracy, Precision, Recall, F1-Score, MCC, ROC-AUC, and PR-AUC as a dict."""
+      return {
             "Accuracy": accuracy_score(self.y_test, self.predictions),
             "Precision": precision_score(self.y_test, self.predictions),
             "Recall": recall_score(self.y_test, self.predictions),
             "F1-Score": f1_score(self.y_test, self.predictions),
             "MCC": matthews_corrcoef(self.y_test, self.predictions),
-            "ROC-AUC": roc_auc_score(self.y_test, self.model.predict_proba(self.X_test)[:,1]),
-            "PR-AUC": average_precision_score(self.y_test, self.model.predict_proba(self.X_test)[:,1])
+            "ROC-AUC": roc_auc_score(self.y_test, self.scores),
+            "PR-AUC": average_precision_score(self.y_test, self.scores)
         }
+
+   def evaluate_model(self):
+      """
+      Prints evaluation metrics including Accuracy, Precision, Recall, F1-Score, MCC, ROC-AUC, and PR-AUC
+      """  
+      metrics = self.metrics()
       print("Evaluation Metrics:")
       for metric, value in metrics.items():
          print(f"{metric}: {value}")
@@ -70,20 +114,21 @@ class Evaluator:
       plt.figure(figsize=(14, 7)) 
       #plt.savefig(os.path.join(plots_dir, f'{algorithm_}_recall_precision.png'))
    
-   def plot_metrics(self, model,X_test, y_test, algorithm_, plots_dir):
+   def plot_metrics(self, model=None, X_test=None, y_test=None, algorithm_=None, plots_dir=None):
       """Generates and saves plots for ROC and Precision-Recall curves.
 
         Args:
-            model: The machine learning model to be evaluated.
-            X_test: The features of the test dataset.
-            y_test: The labels of the test dataset.
+            model: Deprecated, the curves use the model of the Evaluator.
+            X_test: Deprecated, the curves use the scores computed on the test set of the Evaluator.
+            y_test: Deprecated, the curves use the labels of the Evaluator.
             algorithm_: Name of the algorithm used for labeling the plots.
             plots_dir: Directory to save the plots."""
+      y_test, scores = self.y_test, self.scores
       
       fig, ax = plt.subplots(1, 2, figsize=(12, 6))
 
     # ROC curve
-      fpr, tpr, thresholds = roc_curve(y_test, model.predict_proba(X_test)[:, 1])
+      fpr, tpr, thresholds = roc_curve(y_test, scores)
       roc_auc = auc(fpr, tpr)
       ax[0].plot(fpr, tpr, color='darkorange', lw=2, label='ROC curve (area = {:.2f})'.format(roc_auc))
       ax[0].plot([0, 1], [0, 1], color='navy', lw=2, linestyle='--')
@@ -95,7 +140,7 @@ class Evaluator:
       ax[0].legend(loc='lower right')
 
     # Precision-Recall curve
-      precision, recall, thresholds = precision_recall_curve(y_test, self.model.predict_proba(X_test)[:, 1])
+      precision, recall, thresholds = precision_recall_curve(y_test, scores)
       pr_auc = auc(recall, precision)
       ax[1].plot(recall, precision, color='blue', lw=2, label='Precision-Recall curve (area = {:.2f})'.format(pr_auc))
       ax[1].set_xlim([0.0, 1.0])
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+class FeatureCache:
+    """
+    Content-addressed cache for extracted features.
+
+    Every row is stored under the hash of the window's samples together with a hash
+    of the extraction settings, so unchanged windows are never recomputed, no matter
+    which file or position they come from. Rows are kept in a SQLite database and the
+    least recently used ones are evicted once the cache exceeds its size limit.
+    """
+
+    def __init__(self, path: Union[str, Path] = '.data/cache/features.sqlite', max_bytes: int = 1024 ** 3):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str | Path): Location of the SQLite database.
+            max_bytes (int): Maximum total size of the stored feature rows.
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS settings (
+                settings_key TEXT PRIMARY KEY,
+                columns TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS features (
+                settings_key TEXT NOT NULL,
+                window_key TEXT NOT NULL,
+                row BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (settings_key, window_key)
+            );
+            CREATE INDEX IF NOT EXISTS features_last_access ON features (last_access);
+        """)
+
+    @staticmethod
+    def settings_key(settings: Dict) -> str:
+        """Hash the extraction settings; any change invalidates all cached rows."""
+        payload = json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def window_keys(data: pd.DataFrame, column_id: str = 'id', column_sort: str = 'time') -> Tuple[np.ndarray, List[str]]:
+        """
+        Hash every window of a long-format frame.
+
+        The hash covers the names and the (time-sorted) samples of all value columns.
+
+        Returns:
+            Tuple[ndarray, List[str]]: The sorted window ids and one key per id.
+        """
+        data = data.sort_values([column_id, column_sort], kind='stable')
+        value_columns = [column for column in data.columns if column not in (column_id, column_sort)]
+        values = np.ascontiguousarray(data[value_columns].to_numpy(dtype=np.float64))
+        ids, starts = np.unique(data[column_id].to_numpy(), return_index=True)
+        bounds = np.append(starts, len(data))
+        prefix = json.dumps(value_columns).encode()
+        keys = [hashlib.blake2b(prefix + values[start:stop].tobytes(), digest_size=16).hexdigest()
+                for start, stop in zip(bounds[:-1], bounds[1:])]
+        return ids, keys
+
+    @staticmethod
+    def matrix_keys(windows: np.ndarray, kind: str) -> List[str]:
+        """Hash every row of a window matrix."""
+        windows = np.ascontiguousarray(windows, dtype=np.float64)
+        prefix = json.dumps([kind]).encode()
+        return [hashlib.blake2b(prefix + row.tobytes(), digest_size=16).hexdigest() for row in windows]
+
+    def lookup(self, settings_key: str, window_keys: List[str]) -> Tuple[Union[List[str], None], Dict[str, np.ndarray]]:
+        """
+        Fetch the cached rows for the given windows and update the hit statistics.
+
+        Returns:
+            Tuple[List[str] | None, Dict[str, ndarray]]: The feature columns (None if the
+            settings were never cached) and the rows found, keyed by window key.
+        """
+        columns_row = self.connection.execute(
+            "SELECT columns FROM settings WHERE settings_key = ?", (settings_key,)).fetchone()
+        rows = {}
+        unique_keys = list(dict.fromkeys(window_keys))
+        if columns_row is not None:
+            # Stay below SQLite's limit on the number of query parameters
+            for start in range(0, len(unique_keys), 500):
+                batch = unique_keys[start:start + 500]
+                placeholders = ','.join('?' * len(batch))
+                for window_key, row in self.connection.execute(
+                        f"SELECT window_key, row FROM features WHERE settings_key = ? AND window_key IN ({placeholders})",
+                        [settings_key, *batch]):
+                    rows[window_key] = np.frombuffer(row, dtype=np.float64)
+            if rows:
+                self.connection.executemany(
+                    "UPDATE features SET last_access = ? WHERE settings_key = ? AND window_key = ?",
+                    [(time.time(), settings_key, window_key) for window_key in rows])
+                self.connection.commit()
+
+        hits = sum(window_key in rows for window_key in window_keys)
+        self.hits += hits
+        self.misses += len(window_keys) - hits
+        columns = json.loads(columns_row[0]) if columns_row is not None else None
+        return columns, rows
+
+    def store(self, settings_key: str, columns: List[str], window_keys: List[str], rows: np.ndarray) -> None:
+        """
+        Store freshly computed feature rows and evict old rows if the cache is too large.
+
+        Args:
+            settings_key (str): Key of the extraction settings.
+            columns (List[str]): Feature column names, in the order of the row values.
+            window_keys (List[str]): One key per row.
+            rows (ndarray): Feature values of shape (len(window_keys), len(columns)).
+        """
+        rows = np.ascontiguousarray(rows, dtype=np.float64)
+        now = time.time()
+        self.connection.execute("INSERT OR REPLACE INTO settings (settings_key, columns) VALUES (?, ?)",
+                                (settings_key, json.dumps(list(columns))))
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO features (settings_key, window_key, row, size, last_access) VALUES (?, ?, ?, ?, ?)",
+            [(settings_key, window_key, row.tobytes(), row.nbytes, now) for window_key, row in zip(window_keys, rows)])
+        self.connection.commit()
+        self.evict()
+
+    def size(self) -> int:
+        """Total size of the stored feature rows in bytes."""
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM features").fetchone()[0]
+
+    def evict(self) -> None:
+        """Delete the least recently used rows until the cache fits into max_bytes."""
+        excess = self.size() - self.max_bytes
+        if excess <= 0:
+            return
+        freed, stale = 0, []
+        cursor = self.connection.execute("SELECT settings_key, window_key, size FROM features ORDER BY last_access")
+        for settings_key, window_key, size in cursor:
+            stale.append((settings_key, window_key))
+            freed += size
+            if freed >= excess:
+                break
+        cursor.close()
+        self.connection.executemany("DELETE FROM features WHERE settings_key = ? AND window_key = ?", stale)
+        self.connection.commit()
+        logging.info(f"Feature cache: evicted {len(stale)} rows ({freed / 1e6:.1f} MB).")
+
+    def hit_rate(self) -> float:
+        """Fraction of looked-up windows that were found in the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self) -> None:
+        self.connection.close()
@@ -1,22 +1,58 @@
 import json
 import logging
 from pathlib import Path
+import tsfresh
 from tsfresh import extract_features
-from tsfresh.feature_extraction import ComprehensiveFCParameters
+from tsfresh.feature_extraction import ComprehensiveFCParameters, EfficientFCParameters, MinimalFCParameters
+from tsfresh.feature_extraction.settings import from_columns
 from tsfresh.utilities.dataframe_functions import impute
+from tsfresh.utilities.string_manipulation import get_config_from_string
+from tsfresh.utilities.distribution import MapDistributor, MultiprocessingDistributor
+from tsfresh import defaults
+from typing import Callable, Iterable, List, Union
+import numpy as np
 import pandas as pd
 
+from .feature_cache import FeatureCache
+from .window_features import (NATIVE_ONLY_CALCULATORS, WindowFeatureCalculator, band_power_parameters,
+                              supported_fc_parameters)
+
+# Extraction engines selectable with "engine"
+ENGINES = ("tsfresh", "native")
+
+# Local tsfresh distributors selectable with "distributor"
+DISTRIBUTORS = ("multiprocessing", "map")
+
+# Named tsfresh settings that can be selected with "default_fc_parameters"
+FC_PARAMETER_PROFILES = {
+    "ComprehensiveFCParameters": ComprehensiveFCParameters,
+    "EfficientFCParameters": EfficientFCParameters,
+    "MinimalFCParameters": MinimalFCParameters,
+}
+
 class FeatureExtractor:
     """
     FeatureExtractor class for extracting features from time series data using the tsfresh library.
     """
     
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: str = 'config.json'):
         """
         Initialize the FeatureExtractor with configuration from a JSON file.
         """
         self.config = self.load_and_validate_config(config_path)
+        self.profile = self.config['feature_extraction']['default_fc_parameters']
+        self.engine = self.config['feature_extraction'].get('engine', 'tsfresh')
+        if self.engine not in ENGINES:
+            logging.error(f"Unsupported feature extraction engine: {self.engine}")
+            raise ValueError(f"Unsupported feature extraction engine: {self.engine}")
         self.extraction_settings = self.get_extraction_settings()
+        if self.engine == "tsfresh" and self.profile == "kind_to_fc_parameters":
+            native_only = sorted({name for fc_parameters in self.extraction_settings.values()
+                                  for name in fc_parameters if name in NATIVE_ONLY_CALCULATORS})
+            if native_only:
+                logging.error(f"Features {native_only} are only available with the native engine.")
+                raise ValueError(f"Features {native_only} are only available with the native engine.")
+        self.feature_cache = self.make_feature_cache()
         
     def load_and_validate_config(self, config_path: str) -> dict:
         """
@@ -50,24 +86,280 @@ class FeatureExtractor:
     def get_extraction_settings(self):
         """
         Fetch and return feature extraction settings based on the loaded configuration.
+
+        "default_fc_parameters" selects one of the tsfresh settings in FC_PARAMETER_PROFILES or
+        "kind_to_fc_parameters", which loads the per-kind settings stored at
+        "kind_to_fc_parameters_path" (see save_kind_to_fc_parameters).
         """
         feature_extraction_config = self.config['feature_extraction']
         
-        if feature_extraction_config['default_fc_parameters'] == "ComprehensiveFCParameters":
-            return ComprehensiveFCParameters()
+        if self.profile in FC_PARAMETER_PROFILES:
+            return FC_PARAMETER_PROFILES[self.profile]()
+        elif self.profile == "kind_to_fc_parameters":
+            return self.load_kind_to_fc_parameters(feature_extraction_config['kind_to_fc_parameters_path'])
         else:
             logging.error("Unsupported feature extraction parameters.")
             raise ValueError("Unsupported feature extraction parameters.")
+
+    @staticmethod
+    def save_kind_to_fc_parameters(feature_columns, path: str) -> dict:
+        """
+        Derive the tsfresh settings needed to compute exactly the given feature columns
+        (e.g. the columns a trained model uses) and store them as JSON.
+
+        :param feature_columns: Feature column names as produced by tsfresh, e.g. 'data_filtered__mean'.
+        :param path: Path of the JSON file, usually next to the trained model.
+        :return: The kind_to_fc_parameters dictionary.
+        """
+        # tsfresh does not know the native-only calculators, so their settings are parsed here
+        native_columns = [column for column in feature_columns if column.split('__')[1] in NATIVE_ONLY_CALCULATORS]
+        kind_to_fc_parameters = from_columns([column for column in feature_columns if column not in native_columns])
+        for column in native_columns:
+            parts = column.split('__')
+            kind_to_fc_parameters.setdefault(parts[0], {}).setdefault(parts[1], []).append(get_config_from_string(parts))
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as profile_file:
+            json.dump(kind_to_fc_parameters, profile_file, indent=2)
+        logging.info(f"Feature extraction profile with {len(feature_columns)} features saved to {path}.")
+        return kind_to_fc_parameters
+
+    @staticmethod
+    def load_kind_to_fc_parameters(path: str) -> dict:
+        """
+        Load settings stored with save_kind_to_fc_parameters.
+        """
+        try:
+            with open(path, 'r') as profile_file:
+                return json.load(profile_file)
+        except FileNotFoundError:
+            logging.error(f"Feature extraction profile not found at {path}.")
+            raise
     
-    def extract_features(self, data: pd.DataFrame) -> pd.DataFrame:
+    def make_feature_cache(self):
+        """
+        Open the feature cache if "use_cache" is enabled.
+
+        :return: A FeatureCache at "cache_path" limited to "cache_max_mb", or None.
+        """
+        feature_extraction_config = self.config['feature_extraction']
+        if not feature_extraction_config.get('use_cache', False):
+            return None
+        return FeatureCache(feature_extraction_config.get('cache_path', '.data/cache/features.sqlite'),
+                            int(feature_extraction_config.get('cache_max_mb', 1024) * 1024 ** 2))
+
+    def cache_settings_key(self, sampling_rate_hz: Union[float, None] = None) -> str:
+        """
+        Key of everything besides the samples that determines the feature values.
+        """
+        return FeatureCache.settings_key({
+            'engine': self.engine,
+            'profile': self.profile,
+            'settings': self.extraction_settings,
+            'band_edges_hz': self.config['feature_extraction'].get('band_edges_hz'),
+            'sampling_rate_hz': sampling_rate_hz,
+            'tsfresh': tsfresh.__version__,
+        })
+
+    def extract_cached(self, ids: np.ndarray, window_keys: List[str], compute: Callable, settings_key: str,
+                       impute_features: bool = True) -> pd.DataFrame:
+        """
+        Splice cached feature rows and newly computed ones together in window order.
+
+        :param ids: Window ids, used as index of the result.
+        :param window_keys: Content hash of each window.
+        :param compute: Called with the positions of the windows missing from the cache;
+                        returns their features without imputation, one row per position.
+        :param settings_key: Key of the extraction settings, see cache_settings_key.
+        :param impute_features: Impute missing values; False leaves them to the caller.
+        :return: DataFrame with the features of all windows.
+        """
+        columns, rows = self.feature_cache.lookup(settings_key, window_keys)
+        missing = [position for position, window_key in enumerate(window_keys) if window_key not in rows]
+        if missing:
+            computed = compute(missing)
+            if columns is not None:
+                computed = computed.reindex(columns=columns)
+            columns = list(computed.columns)
+            computed_rows = computed.to_numpy(dtype=np.float64)
+            missing_keys = [window_keys[position] for position in missing]
+            self.feature_cache.store(settings_key, columns, missing_keys, computed_rows)
+            rows.update(zip(missing_keys, computed_rows))
+
+        logging.info(f"Feature cache: {len(window_keys) - len(missing)} of {len(window_keys)} windows cached, "
+                     f"hit rate {self.feature_cache.hit_rate():.1%}.")
+        matrix = np.vstack([rows[window_key] for window_key in window_keys])
+        features = pd.DataFrame(matrix, index=ids, columns=columns)
+        return impute(features) if impute_features else features
+
+    def extract_features(self, data: pd.DataFrame, impute_features: bool = True) -> pd.DataFrame:
         """
         Extract time series features from the provided data using the tsfresh library.
+
+        With "use_cache" enabled only windows whose samples are not in the feature
+        cache are passed to tsfresh.
         
         :param data: Pandas DataFrame with columns 'id', 'time', and 'value'.
+        :param impute_features: Impute missing values; False leaves them to the caller, e.g.
+                                to impute the features of several blocks of a file together.
         :return: DataFrame with extracted features.
         """
+        if self.feature_cache is None:
+            return self.run_tsfresh(data, impute_function=impute if impute_features else None)
+
+        ids, window_keys = FeatureCache.window_keys(data)
+        return self.extract_cached(
+            ids, window_keys,
+            lambda missing: self.run_tsfresh(data[data['id'].isin(ids[missing])]).reindex(ids[missing]),
+            self.cache_settings_key(), impute_features)
+
+    def run_tsfresh(self, data: pd.DataFrame, impute_function=None) -> pd.DataFrame:
+        """
+        Run tsfresh with the configured settings and parallelism.
+        """
+        if self.profile == "kind_to_fc_parameters":
+            settings = {'kind_to_fc_parameters': self.extraction_settings}
+        else:
+            settings = {'default_fc_parameters': self.extraction_settings}
         extracted_features = extract_features(data,
                                               column_id='id', column_sort='time',
-                                              default_fc_parameters=self.extraction_settings,
-                                              impute_function=impute)
+                                              impute_function=impute_function,
+                                              n_jobs=self.n_jobs(),
+                                              chunksize=self.config['feature_extraction'].get('chunksize', defaults.CHUNKSIZE),
+                                              distributor=self.make_distributor(),
+                                              **settings)
         return extracted_features
+
+    def n_jobs(self) -> int:
+        """
+        Number of extraction workers from "n_jobs"; null in the config means a single worker.
+        """
+        return self.config['feature_extraction'].get('n_jobs', defaults.N_PROCESSES) or 1
+
+    def make_distributor(self):
+        """
+        Create the tsfresh distributor configured with "distributor" and "n_jobs".
+
+        "multiprocessing" runs the chunks on a local process pool with "n_jobs" workers,
+        "map" runs them sequentially in this process. tsfresh closes the distributor
+        after each extraction, so a new one is created per call.
+
+        :return: The distributor, or None to let tsfresh choose one.
+        """
+        feature_extraction_config = self.config['feature_extraction']
+        distributor = feature_extraction_config.get('distributor')
+        n_jobs = self.n_jobs()
+        if distributor is None:
+            return None
+        elif distributor == "multiprocessing" and n_jobs > 1:
+            return MultiprocessingDistributor(n_workers=n_jobs, progressbar_title="Feature Extraction")
+        elif distributor in DISTRIBUTORS:
+            return MapDistributor(progressbar_title="Feature Extraction")
+        else:
+            logging.error(f"Unsupported feature extraction distributor: {distributor}")
+            raise ValueError(f"Unsupported feature extraction distributor: {distributor}")
+
+    def extract_features_batch(self, frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+        """
+        Extract features from several files with a single tsfresh run.
+
+        The window ids are made unique across the files, so all windows are spread
+        over one worker pool instead of starting a pool per file. Note that missing
+        values are imputed with statistics over the whole batch.
+
+        :param frames: DataFrames with columns 'id', 'time' and the signal, one per file.
+        :return: One feature DataFrame per input frame, indexed by the original window ids.
+        """
+        shifted_frames, window_ids = [], []
+        next_id = 0
+        for data in frames:
+            ids, codes = np.unique(data['id'].to_numpy(), return_inverse=True)
+            shifted_frames.append(data.assign(id=codes + next_id))
+            window_ids.append(ids)
+            next_id += len(ids)
+
+        features = self.extract_features(pd.concat(shifted_frames, ignore_index=True))
+
+        results = []
+        start = 0
+        for ids in window_ids:
+            part = features.reindex(np.arange(start, start + len(ids)))
+            part.index = ids
+            results.append(part)
+            start += len(ids)
+        return results
+
+    def native_calculator(self, kind: str, sampling_rate_hz: Union[float, None] = None) -> WindowFeatureCalculator:
+        """
+        Build the native calculator for one kind from the configured settings.
+
+        Named profiles are restricted to the calculators the native engine supports
+        and extended by the band powers of "band_edges_hz" if the sampling rate is known.
+        A kind_to_fc_parameters profile must be fully supported, because the trained
+        model expects exactly those columns.
+        """
+        if self.profile == "kind_to_fc_parameters":
+            return WindowFeatureCalculator(self.extraction_settings.get(kind, {}), sampling_rate_hz)
+        fc_parameters = supported_fc_parameters(self.extraction_settings)
+        skipped = sorted(set(self.extraction_settings) - set(fc_parameters))
+        if skipped:
+            logging.warning(f"Native engine skips {len(skipped)} calculators of {self.profile}: {skipped}")
+        band_edges_hz = self.config['feature_extraction'].get('band_edges_hz')
+        if band_edges_hz and sampling_rate_hz is None:
+            logging.warning("Band powers are skipped because the sampling rate of the windows is unknown.")
+        elif band_edges_hz:
+            fc_parameters.update(band_power_parameters(band_edges_hz))
+        return WindowFeatureCalculator(fc_parameters, sampling_rate_hz)
+
+    def extract_window_features(self, windows: np.ndarray, kind: str = 'data_filtered',
+                                sampling_rate_hz: Union[float, None] = None,
+                                impute_features: bool = True) -> pd.DataFrame:
+        """
+        Extract features from a window matrix, e.g. a preprocessed .npy file.
+
+        With engine "native" the features are computed directly on the matrix;
+        with "tsfresh" the windows are converted to the long format first.
+
+        :param windows: Array of shape (n_windows, window_length).
+        :param kind: Name of the signal column.
+        :param sampling_rate_hz: Sampling rate of the windows, needed for the band powers of the native engine.
+        :param impute_features: Impute missing values; False leaves them to the caller.
+        :return: DataFrame with one row per window.
+        """
+        windows = np.asarray(windows)
+        if self.engine == "native":
+            calculator = self.native_calculator(kind, sampling_rate_hz)
+            if self.feature_cache is None:
+                features = calculator.extract(windows, kind)
+                return impute(features) if impute_features else features
+            return self.extract_cached(np.arange(len(windows)), FeatureCache.matrix_keys(windows, kind),
+                                       lambda missing: calculator.extract(windows[missing], kind),
+                                       self.cache_settings_key(sampling_rate_hz), impute_features)
+        n_windows, window_length = windows.shape
+        data = pd.DataFrame({
+            'id': np.repeat(np.arange(n_windows), window_length),
+            'time': np.tile(np.arange(window_length), n_windows),
+            kind: windows.ravel(),
+        })
+        return self.extract_features(data, impute_features)
+
+    def extract_window_blocks(self, blocks: Iterable, kind: str = 'data_filtered',
+                              sampling_rate_hz: Union[float, None] = None) -> pd.DataFrame:
+        """
+        Extract features block by block, e.g. from SignalPreprocessor.iter_window_blocks.
+
+        Only one block of windows is read at a time. Missing values are imputed once
+        over all blocks, so the result matches a single extraction of the whole file.
+
+        :param blocks: Iterable of (id of the first window, window matrix).
+        :param kind: Name of the signal column.
+        :param sampling_rate_hz: Sampling rate of the windows, see extract_window_features.
+        :return: DataFrame with one row per window, indexed by window id.
+        """
+        parts = []
+        for first_window, windows in blocks:
+            features = self.extract_window_features(windows, kind, sampling_rate_hz, impute_features=False)
+            features.index = np.arange(first_window, first_window + len(windows))
+            parts.append(features)
+        if not parts:
+            return pd.DataFrame()
+        return impute(pd.concat(parts))
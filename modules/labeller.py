@@ -0,0 +1,124 @@
+import logging
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+class Labeller:
+    """
+    Labels feature windows from the anomaly intervals in config.json["labelling"].
+
+    Labels are kept in a small sidecar CSV with one (file, id, label) row per window,
+    so changing an interval only rewrites the sidecar. The feature files are joined
+    with their labels by window id when the training data is loaded.
+    """
+
+    def __init__(self, labelling_config: Dict, preprocessor):
+        """
+        Initialize the Labeller.
+
+        Args:
+            labelling_config (dict): The "labelling" section of config.json.
+            preprocessor (SignalPreprocessor): Preprocessor with the window length and hop used
+                for the feature files, to derive the window start and end times.
+        """
+        self.anomaly_intervals = labelling_config['anomaly_intervals']
+        self.min_overlap = labelling_config.get('min_overlap', 0.0)
+        self.labels_path = Path(labelling_config.get('labels_path', '.data/labels.csv'))
+        self.preprocessor = preprocessor
+
+    def label_windows(self, window_ids, intervals: List[Dict]) -> np.ndarray:
+        """
+        Label windows that overlap any of the intervals as 1, all others as 0.
+
+        All windows are joined against all intervals at once. With min_overlap > 0
+        a window also has to lie at least that fraction of its length inside one interval.
+
+        Args:
+            window_ids (array_like): Window ids of a feature file.
+            intervals (List[dict]): Anomaly intervals with 'start' and 'end' in seconds.
+
+        Returns:
+            np.ndarray: Labels as integers.
+        """
+        window_start = self.preprocessor.window_start_times(window_ids)[:, None]
+        window_length = self.preprocessor.window_length_ms / 1000
+        window_end = window_start + window_length
+        starts = np.array([interval['start'] for interval in intervals], dtype=float)[None, :]
+        ends = np.array([interval['end'] for interval in intervals], dtype=float)[None, :]
+
+        overlaps = (window_start <= ends) & (window_end > starts)
+        if self.min_overlap > 0:
+            overlap_fraction = (np.minimum(window_end, ends) - np.maximum(window_start, starts)) / window_length
+            overlaps &= overlap_fraction >= self.min_overlap
+        return overlaps.any(axis=1).astype(int)
+
+    @staticmethod
+    def count_windows(feature_file: Path) -> int:
+        """Number of windows (data rows) in a feature CSV, counted without parsing it."""
+        with open(feature_file, 'rb') as file:
+            n_lines = sum(chunk.count(b'\n') for chunk in iter(lambda: file.read(1 << 20), b''))
+            file.seek(-1, 2)
+            if file.read(1) != b'\n':
+                n_lines += 1
+        return max(n_lines - 1, 0)
+
+    def build_labels(self, features_directory: Union[str, Path]) -> pd.DataFrame:
+        """
+        Label all windows of the feature files listed in the anomaly intervals.
+
+        Args:
+            features_directory (str | Path): Directory with the extracted feature files.
+
+        Returns:
+            pd.DataFrame: Frame with 'file', 'id' and 'label' columns.
+        """
+        features_directory = Path(features_directory)
+        labels = []
+        for file_name, intervals in self.anomaly_intervals.items():
+            feature_file = features_directory / f"{file_name}.csv"
+            if not feature_file.is_file():
+                logging.warning(f"Feature file not found for {file_name}")
+                continue
+            window_ids = np.arange(self.count_windows(feature_file))
+            labels.append(pd.DataFrame({
+                'file': file_name,
+                'id': window_ids,
+                'label': self.label_windows(window_ids, intervals),
+            }))
+        if not labels:
+            return pd.DataFrame(columns=['file', 'id', 'label'])
+        return pd.concat(labels, ignore_index=True)
+
+    def save_labels(self, labels: pd.DataFrame) -> Path:
+        """Write the label sidecar to labels_path."""
+        self.labels_path.parent.mkdir(parents=True, exist_ok=True)
+        labels.to_csv(self.labels_path, index=False)
+        logging.info(f"{int(labels['label'].sum())} of {len(labels)} windows labelled as anomalies in {self.labels_path}.")
+        return self.labels_path
+
+    @staticmethod
+    def load_labelled_features(features_directory: Union[str, Path], labels_path: Union[str, Path]) -> pd.DataFrame:
+        """
+        Join the feature files with the label sidecar by window id.
+
+        Only the files and windows listed in the sidecar are loaded.
+
+        Args:
+            features_directory (str | Path): Directory with the extracted feature files.
+            labels_path (str | Path): The label sidecar written by save_labels.
+
+        Returns:
+            pd.DataFrame: Features with a 'label' column, indexed by (file, id).
+        """
+        features_directory = Path(features_directory)
+        labels = pd.read_csv(labels_path)
+        parts = []
+        for file_name, file_labels in labels.groupby('file', sort=False):
+            # Row i of a feature file holds the features of window id i
+            features = pd.read_csv(features_directory / f"{file_name}.csv").iloc[file_labels['id'].to_numpy()]
+            features.index = pd.MultiIndex.from_arrays([file_labels['file'], file_labels['id']], names=['file', 'id'])
+            features['label'] = file_labels['label'].to_numpy()
+            parts.append(features)
+        return pd.concat(parts)
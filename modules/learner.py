@@ -3,25 +3,82 @@ from sklearn.tree import DecisionTreeClassifier
 from sklearn.neighbors import KNeighborsClassifier
 from numpy import ndarray
 from sklearn.metrics import classification_report, accuracy_score
-from sklearn.model_selection import cross_val_score
+from sklearn.model_selection import StratifiedGroupKFold, StratifiedKFold
+from sklearn.base import clone
+from joblib import Parallel, delayed
+from imblearn.over_sampling import RandomOverSampler
+import joblib
+import numpy as np
+import hashlib
+import json
+import os
+import time
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from .model import Model
 
+def _take(X, indices):
+    """Select rows of a DataFrame or an array by position."""
+    return X.iloc[indices] if hasattr(X, 'iloc') else X[indices]
+
+def fit_fold(model, X, y: ndarray, train: ndarray, test: ndarray, cache_path: str = None, oversample: bool = False) -> dict:
+    """Fit one cross-validation fold and predict its test part, or load the result from the cache.
+
+    Args:
+        model: unfitted estimator, cloned for the fold
+        X (DataFrame | ndarray): features
+        y (ndarray): target values
+        train (ndarray): positions of the training rows
+        test (ndarray): positions of the test rows
+        cache_path (str, optional): file of the cached fold result. Defaults to None (no caching).
+        oversample (bool, optional): randomly oversample the minority class of the training part only. Defaults to False.
+
+    Returns:
+        dict: test positions, predictions, positive-class scores, accuracy and fit time of the fold
+    """
+    if cache_path is not None and os.path.exists(cache_path):
+        return joblib.load(cache_path)
+
+    X_fold, y_fold = _take(X, train), y[train]
+    if oversample:
+        X_fold, y_fold = RandomOverSampler(random_state=42).fit_resample(X_fold, y_fold)
+    start = time.perf_counter()
+    fold_model = clone(model).fit(X_fold, y_fold)
+    fit_time = time.perf_counter() - start
+    probabilities = fold_model.predict_proba(_take(X, test))
+    predictions = fold_model.classes_.take(np.argmax(probabilities, axis=1))
+    result = {
+        "test": test,
+        "predictions": predictions,
+        "scores": probabilities[:, 1],
+        "accuracy": accuracy_score(y[test], predictions),
+        "fit_time": fit_time,
+    }
+    if cache_path is not None:
+        joblib.dump(result, cache_path)
+    return result
+
 class Learner (Model):
+    # Algorithms a Learner can be built for, and those that fit on several cores
+    ALGORITHMS = ('random_forest', 'k_nearest_neighbors', 'decision_tree')
+    PARALLEL_ALGORITHMS = ('random_forest',)
+    # Tree models convert X to float32 inside fit
+    FLOAT32_ALGORITHMS = ('random_forest', 'decision_tree')
+
     def __init__(self, config: dict = {"name": 'random_forest', 'n_estimators': 1000, 'random_state': 42}) -> None:
         """Initializes the Learner with the specified algorithm
 
         Args:
             config (dict, optional): config dictionary of the specified algorithm. Defaults to {"name": 'random_forest', 'n_estimators': 1000, 'random_state': 42}.
+                An optional "n_jobs" sets the number of cores used by random_forest and k_nearest_neighbors.
         """
         self.config = config
         if config["name"] == 'random_forest':
-            self.model = RandomForestClassifier(n_estimators=config["n_estimators"], random_state=config["random_state"])
+            self.model = RandomForestClassifier(n_estimators=config["n_estimators"], random_state=config["random_state"], n_jobs=config.get("n_jobs"))
         elif  config["name"] == 'k_nearest_neighbors':
-            self.model = KNeighborsClassifier(n_neighbors = config['n_neighbors']) 
+            self.model = KNeighborsClassifier(n_neighbors = config['n_neighbors'], n_jobs=config.get("n_jobs")) 
         elif  config["name"] == 'decision_tree':
             self.model = DecisionTreeClassifier(max_depth = config["max_depth"]) 
         super().__init__(self.model)
@@ -37,26 +94,96 @@ class Learner (Model):
         """
         return self.model.predict(X_test)
     
-    def accuracy(self, X_test: ndarray, y_test: ndarray) -> None:
+    def accuracy(self, X_test: ndarray, y_test: ndarray, predictions: ndarray = None) -> None:
         """Evaluates the trained model on the test data and prints a classification report.
 
         Args:
             X_test (ndarray): array containing the test features data to provide the accuracy
             y_test (ndarray): array containing the true labels of the testing set.
+            predictions (ndarray, optional): predictions already made on X_test (e.g. Evaluator.predictions), to skip predicting again.
         """
-        predictions = self.predict(X_test)
+        if predictions is None:
+            predictions = self.predict(X_test)
         score = accuracy_score(y_test, predictions)
         print(classification_report(y_test, predictions))
         print(f"Accuracy: {round(score * 100, 2)}") # type: ignore
 
-    def cross_validation(self,  X_train: ndarray, y_train: ndarray) -> None:
+    def cross_validation(self,  X_train: ndarray, y_train: ndarray, groups: ndarray = None, cv: int = 10, n_jobs: int = None, cache_directory: str = None, oversample: bool = False) -> dict:
         """Perform cross-validated scoring for an estimator on the dataset to assess how well the model will generalize on independant dataset
 
+        Folds run in parallel with n_jobs. With groups (e.g. the measurement of every window) the folds never split
+        a group, so neighbouring windows of one measurement cannot end up in training and test part of the same fold,
+        and keep the class ratio as far as the groups allow. Every fold needs both classes in its training part.
+        With a cache_directory every fold result is stored under a hash of the data and the model config, and reused
+        on the next run. The out-of-fold predictions are returned for out-of-fold metrics. Pass the training data before
+        oversampling and set oversample instead: every fold then oversamples its own training part, so copies of a
+        minority row never end up in a test part and every original row is scored exactly once.
+
         Args:
             X_train (ndarray): array containing the features for training data for the cross_validation
             y_train (ndarray): array containing the target values for the cross_validation
+            groups (ndarray, optional): group of every sample for grouped folds. Defaults to None (stratified folds).
+            cv (int, optional): number of folds, at most the number of groups. Defaults to 10.
+            n_jobs (int, optional): number of folds fitted in parallel. Defaults to None (sequential).
+            cache_directory (str, optional): directory of the fold cache. Defaults to None (no caching).
+            oversample (bool, optional): oversample the minority class in the training part of every fold. Defaults to False.
+
+        Returns:
+            dict: accuracy of every fold ("scores") and the out-of-fold "predictions" and positive-class "probabilities"
         """
-        scores = cross_val_score(self.model, X_train, y_train, cv=10, scoring = "accuracy")
+        y_train = np.asarray(y_train)
+        if groups is not None:
+            groups = np.asarray(groups)
+            splitter = StratifiedGroupKFold(n_splits=min(cv, len(np.unique(groups))))
+        else:
+            splitter = StratifiedKFold(n_splits=cv)
+        folds = list(splitter.split(X_train, y_train, groups))
+        for index, (train, _) in enumerate(folds):
+            if len(np.unique(y_train[train])) < 2:
+                raise ValueError(f"The training part of fold {index} only contains class {y_train[train][0]}; "
+                                 "use fewer folds or more groups with both classes")
+
+        cache_paths = [None] * len(folds)
+        if cache_directory is not None:
+            os.makedirs(cache_directory, exist_ok=True)
+            key = self.cross_validation_key(X_train, y_train, groups, oversample)
+            cache_paths = [os.path.join(cache_directory, f"{key}_{hashlib.sha256(test.tobytes()).hexdigest()[:16]}.joblib")
+                           for _, test in folds]
+
+        results = Parallel(n_jobs=n_jobs)(delayed(fit_fold)(self.model, X_train, y_train, train, test, cache_path, oversample)
+                                          for (train, test), cache_path in zip(folds, cache_paths))
+
+        scores = np.array([result["accuracy"] for result in results])
+        predictions = np.empty_like(y_train)
+        probabilities = np.empty(len(y_train))
+        for result in results:
+            predictions[result["test"]] = result["predictions"]
+            probabilities[result["test"]] = result["scores"]
+
         print("Scores:", scores) 
         print("Mean:", scores.mean())
         print("Standard Deviation:", scores.std())
+        return {"scores": scores, "predictions": predictions, "probabilities": probabilities}
+
+    def cross_validation_key(self, X_train: ndarray, y_train: ndarray, groups: ndarray = None, oversample: bool = False) -> str:
+        """Hash of the training data, the groups, the oversampling and the model config, used as fold cache key.
+
+        Args:
+            X_train (ndarray): features for training data
+            y_train (ndarray): target values
+            groups (ndarray, optional): group of every sample. Defaults to None.
+            oversample (bool, optional): whether the folds oversample their training part. Defaults to False.
+
+        Returns:
+            str: hex digest
+        """
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(np.asarray(X_train, dtype=np.float64)).tobytes())
+        digest.update(np.ascontiguousarray(y_train).tobytes())
+        if groups is not None:
+            digest.update(json.dumps([str(group) for group in groups]).encode())
+        # n_jobs does not change the fitted model, so it is left out of the key
+        params = {key: value for key, value in self.model.get_params().items() if key != 'n_jobs'}
+        digest.update(json.dumps({"name": self.config["name"], "params": params, "oversample": oversample},
+                                 sort_keys=True, default=str).encode())
+        return digest.hexdigest()
@@ -0,0 +1,158 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+class MeasurementStore:
+    """
+    Indexed on-disk store for raw measurements.
+
+    All samples are kept in one binary file in which every measurement occupies a
+    contiguous block of float64 values. A small JSON index maps each
+    (experiment, measurement) pair to its offset and length, so a single
+    measurement is loaded as a memory-mapped slice instead of parsing the whole dataset.
+    """
+
+    SIGNALS_FILE = 'signals.bin'
+    INDEX_FILE = 'index.json'
+    DTYPE = np.float64
+
+    def __init__(self, directory: Union[str, Path] = '.data/measurement_store', sampling_rate_hz: float = 10e3):
+        """
+        Initialize the store.
+
+        Args:
+            directory (str | Path): Directory containing the signal file and its index.
+            sampling_rate_hz (float): Sampling rate used to derive the time axis when writing.
+        """
+        self.directory = Path(directory)
+        self.sampling_rate_hz = sampling_rate_hz
+        self._index = None
+
+    @property
+    def signals_path(self) -> Path:
+        return self.directory / self.SIGNALS_FILE
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / self.INDEX_FILE
+
+    def exists(self) -> bool:
+        """Return True if the store has been written."""
+        return self.signals_path.is_file() and self.index_path.is_file()
+
+    def write(self, measurements: Iterable[Tuple[str, str, np.ndarray]]) -> None:
+        """
+        Write measurements to the store, replacing any previous content.
+
+        The measurements are appended one after another, so only one of them has
+        to be held in memory at a time.
+
+        Args:
+            measurements (Iterable[Tuple[str, str, ndarray]]): (experiment, measurement, values) triples.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_signals_path = self.signals_path.with_suffix('.bin.tmp')
+        entries = []
+        offset = 0
+        with open(tmp_signals_path, 'wb') as signals_file:
+            for experiment, measurement, values in measurements:
+                values = np.ascontiguousarray(values, dtype=self.DTYPE)
+                signals_file.write(values.tobytes())
+                entries.append({'experiment': experiment, 'measurement': measurement,
+                                'offset': offset, 'length': len(values)})
+                offset += len(values)
+
+        index = {'dtype': np.dtype(self.DTYPE).name, 'sampling_rate_hz': self.sampling_rate_hz, 'entries': entries}
+        tmp_index_path = self.index_path.with_suffix('.json.tmp')
+        with open(tmp_index_path, 'w') as index_file:
+            json.dump(index, index_file, indent=2)
+        os.replace(tmp_signals_path, self.signals_path)
+        os.replace(tmp_index_path, self.index_path)
+        self._index = index
+        logging.info(f"Wrote {len(entries)} measurements ({offset} samples) to {self.directory}.")
+
+    def write_frame(self, data: pd.DataFrame) -> None:
+        """
+        Write a combined frame as returned by DataLoader.load_experiment_data to the store.
+
+        Args:
+            data (pd.DataFrame): Frame with 'data', 'experiment' and 'measurement' columns.
+        """
+        groups = data.groupby(['experiment', 'measurement'], sort=False)['data']
+        self.write((experiment, measurement, values.to_numpy()) for (experiment, measurement), values in groups)
+
+    def read_index(self) -> Dict:
+        """Load (and memoize) the offset index."""
+        if self._index is None:
+            if not self.exists():
+                raise FileNotFoundError(f"No measurement store found at {self.directory}.")
+            with open(self.index_path, 'r') as index_file:
+                self._index = json.load(index_file)
+        return self._index
+
+    def entries(self, experiment_name: Union[str, None] = None) -> List[Dict]:
+        """
+        List the index entries in storage order.
+
+        Args:
+            experiment_name (str, optional): Restrict the entries to one experiment.
+        """
+        entries = self.read_index()['entries']
+        if experiment_name is None:
+            return list(entries)
+        return [entry for entry in entries if entry['experiment'] == experiment_name]
+
+    def load_values(self, experiment_name: str, measurement_name: str) -> np.ndarray:
+        """
+        Return the samples of one measurement as a read-only memory-mapped array.
+        """
+        for entry in self.entries(experiment_name):
+            if entry['measurement'] == measurement_name:
+                return self._memmap(entry['offset'], entry['length'])
+        raise KeyError(f"Measurement {experiment_name}/{measurement_name} not found in {self.directory}.")
+
+    def load(self, experiment_name: str, measurement_name: Union[str, None] = None) -> pd.DataFrame:
+        """
+        Load one measurement or all measurements of an experiment.
+
+        The returned frame has the same layout as the former full_dataframe.csv:
+        'time' continues across the whole store, so it matches the time column of
+        DataLoader.load_experiment_data for all experiments.
+
+        Args:
+            experiment_name (str): The name of the experiment to load.
+            measurement_name (str, optional): The measurement to load. If None, loads all measurements of the experiment.
+
+        Returns:
+            pd.DataFrame: Frame with 'time', 'data', 'experiment' and 'measurement' columns (empty if nothing matches).
+        """
+        entries = self.entries(experiment_name)
+        if measurement_name is not None:
+            entries = [entry for entry in entries if entry['measurement'] == measurement_name]
+        if not entries:
+            return pd.DataFrame(columns=['time', 'data', 'experiment', 'measurement'])
+
+        sampling_rate_hz = self.read_index()['sampling_rate_hz']
+        parts = [self.frame_from_entry(entry, sampling_rate_hz) for entry in entries]
+        return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+
+    def frame_from_entry(self, entry: Dict, sampling_rate_hz: float) -> pd.DataFrame:
+        """Build the frame for a single index entry."""
+        offset, length = entry['offset'], entry['length']
+        return pd.DataFrame({
+            'time': np.arange(offset + 1, offset + length + 1) / sampling_rate_hz,
+            'data': np.array(self._memmap(offset, length)),
+            'experiment': entry['experiment'],
+            'measurement': entry['measurement'],
+        })
+
+    def _memmap(self, offset: int, length: int) -> np.ndarray:
+        dtype = np.dtype(self.read_index()['dtype'])
+        if length == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self.signals_path, dtype=dtype, mode='r', offset=offset * dtype.itemsize, shape=(length,))
@@ -1,21 +1,53 @@
-from sklearn.ensemble import RandomForestClassifier
+import hashlib
+import json
+import logging
+import math
+import os
+import random
 import sys
+import threading
+import time
 from pathlib import Path
-from sklearn.model_selection import GridSearchCV
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
 from numpy import ndarray
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import GridSearchCV, ParameterGrid, StratifiedKFold
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from .model import Model
 
+def _trial_key(params: dict, fold: int) -> str:
+    """Key of one trial, independent of the order of the parameters."""
+    return json.dumps({"params": params, "fold": fold}, sort_keys=True)
+
+def _rows(X, index: ndarray):
+    """Select rows of a DataFrame or an array by position."""
+    return X.iloc[index] if hasattr(X, 'iloc') else X[index]
+
 class RandomForestOptimizer (Model):
+    # "grid" is the exhaustive GridSearchCV, the others grow the forests with warm_start
+    STRATEGIES = ("grid", "halving", "random")
+
     def __init__(self,  config: dict):
         self.rf_model = RandomForestClassifier(criterion=config['criterion'], min_samples_leaf = config["min_samples_leaf"], min_samples_split = config["min_samples_split"], n_estimators=config["n_estimators"], max_features=config['n_estimators'], oob_score= config['oob_score'], random_state=config['random_state'], n_jobs=config["n_jobs"])
         self.config = config
+        self.trials = []
+        self.completed_trials = {}
+        self.trials_path = config.get('tuning', {}).get('trials_path')
+        self.trials_lock = threading.Lock()
         super().__init__(self.rf_model)
         
     def hyper_parameter_tuning(self, X_train: ndarray , y_train: ndarray) -> None:
         """
-        Fit the RandomForestClasifier model using grid search.
+        Fit the RandomForestClasifier model using the search strategy of config["tuning"]["strategy"].
+
+        "grid" (default) runs GridSearchCV over the whole param_grid, "halving" and "random"
+        run the budgeted search (see budgeted_search).
 
         Best Parameter: {'criterion': 'entropy', 'min_samples_leaf': 1, 'min_samples_split': 4, 'n_estimators': 100} 
         Best Estimator: RandomForestClassifier(criterion='entropy', max_features=100,
@@ -29,15 +61,260 @@ class RandomForestOptimizer (Model):
         - y_train (ndarray): Target values.
 
         """
+        tuning = self.config['tuning']
+        strategy = tuning.get('strategy', 'grid')
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown search strategy {strategy!r}, expected one of {self.STRATEGIES}")
+        if strategy != 'grid':
+            self.budgeted_search(X_train, y_train)
+            return
+
         self.clf = GridSearchCV(estimator=self.model,
                                  param_grid=self.config["param_grid"],
-                                 n_jobs=self.config['tuning']['n_jobs'], 
-                                 cv = self.config['tuning']['cv'], 
-                                 scoring= self.config['tuning']['scoring'])
+                                 n_jobs=tuning['n_jobs'], 
+                                 cv = tuning['cv'], 
+                                 scoring= tuning.get('scoring', 'accuracy'))
         self.clf.fit(X_train, y_train)
+        self.best_params_ = self.clf.best_params_
+        self.best_score_ = self.clf.best_score_
+        self.best_estimator_ = self.clf.best_estimator_
 
         print(f'Best Parameter: {self.clf.best_params_} \n Best Estimator: {self.clf.best_estimator_} \n Best Score: {self.clf.best_score_} \n Classes: {self.clf.classes_} \n Features name {self.clf.feature_names_in_}') 
-       
+
+    def candidates(self) -> List[Dict]:
+        """All combinations of param_grid without n_estimators, in the order of the tuning strategy.
+
+        Returns:
+            List[dict]: the candidate parameters
+        """
+        tuning = self.config['tuning']
+        grid = {name: values for name, values in self.config["param_grid"].items() if name != 'n_estimators'}
+        candidates = list(ParameterGrid(grid))
+        n_candidates = tuning.get('n_candidates')
+        if tuning.get('strategy') == 'random' or n_candidates:
+            random.Random(tuning.get('random_state', self.config['random_state'])).shuffle(candidates)
+        return candidates[:n_candidates] if n_candidates else candidates
+
+    def grow(self, forests: list, params: dict, n_estimators: int, X_train, y_train, scorer,
+             deadline: float = None) -> Union[float, None]:
+        """Grow the forests of one candidate to n_estimators trees and score them on their folds.
+
+        With warm_start only the missing trees are fitted, so the forests of every rung
+        build on the ones of the previous rung. Folds already in completed_trials are not
+        fitted again; their forest catches up on the next rung that has to be fitted, and
+        since warm_start draws the seeds of the trees in order it ends up with the same trees.
+        The folds are grown by tuning["n_jobs"] threads (see fold_jobs); the budget is
+        checked before every fold.
+
+        Args:
+            forests (list): (forest, train index, validation index) per fold
+            params (dict): the candidate parameters
+            n_estimators (int): number of trees of the rung
+            X_train (DataFrame | ndarray): training data
+            y_train (ndarray): target values
+            scorer (callable): scorer of config["tuning"]["scoring"]
+            deadline (float, optional): time.perf_counter() value after which no fold is started. Defaults to None.
+
+        Returns:
+            float: the mean validation score over the folds, or None if the budget ran out before all folds were fitted
+        """
+        trial_params = {**params, "n_estimators": n_estimators}
+
+        def grow_fold(fold, forest, train_index, validation_index):
+            completed = self.completed_trials.get(_trial_key(trial_params, fold))
+            if completed is not None:
+                return completed["score"]
+            if deadline is not None and time.perf_counter() > deadline:
+                return None
+            start = time.perf_counter()
+            forest.set_params(n_estimators=n_estimators)
+            forest.fit(_rows(X_train, train_index), y_train[train_index])
+            # Time to fit the trees added for this rung
+            fit_time = time.perf_counter() - start
+            score = scorer(forest, _rows(X_train, validation_index), y_train[validation_index])
+            self.save_trial({"params": trial_params, "fold": fold, "score": float(score), "fit_time": fit_time})
+            return score
+
+        # The forests are fitted in place, so the folds share them through threads
+        scores = Parallel(n_jobs=self.fold_jobs(len(forests))[0], prefer="threads")(
+            delayed(grow_fold)(fold, *entry) for fold, entry in enumerate(forests))
+        if any(score is None for score in scores):
+            return None
+        return float(np.mean(scores))
+
+    def fold_jobs(self, n_folds: int) -> Tuple[int, int]:
+        """Split the cores between concurrently grown folds and the trees of each forest.
+
+        tuning["n_jobs"] folds are grown at the same time (at most n_folds), and each forest
+        gets an equal share of the cores of the forest's own n_jobs.
+
+        Args:
+            n_folds (int): number of cross-validation folds
+
+        Returns:
+            Tuple[int, int]: number of folds grown concurrently and n_jobs of every forest
+        """
+        fold_jobs = min(effective_n_jobs(self.config['tuning'].get('n_jobs', 1)), n_folds)
+        return fold_jobs, max(1, effective_n_jobs(self.config['n_jobs']) // fold_jobs)
+
+    def search_key(self, X_train, y_train) -> str:
+        """Hash of the training data, the folds, the scoring and the base forest.
+
+        Trials are only resumed from runs with the same key, so a changed data set or
+        tuning config starts a fresh search in the same trials file.
+
+        Args:
+            X_train (DataFrame | ndarray): training data
+            y_train (ndarray): target values
+
+        Returns:
+            str: hex digest
+        """
+        tuning = self.config['tuning']
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(np.asarray(X_train, dtype=np.float64)).tobytes())
+        digest.update(np.ascontiguousarray(y_train).tobytes())
+        # n_jobs does not change the fitted forests, so it is left out of the key
+        params = {key: value for key, value in self.model.get_params().items() if key != 'n_jobs'}
+        folds = {"cv": tuning['cv'], "random_state": tuning.get('random_state', self.config['random_state']),
+                 "scoring": tuning.get('scoring', 'accuracy')}
+        digest.update(json.dumps({"params": params, "folds": folds}, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def load_trials(self) -> Dict:
+        """Read the completed trials of the current search from trials_path.
+
+        A line cut off by an interrupted write is skipped.
+
+        Returns:
+            dict: trials by (params, fold) key
+        """
+        completed, line = {}, ''
+        if not self.trials_path or not os.path.isfile(self.trials_path):
+            return completed
+        with open(self.trials_path, encoding='utf-8') as trials_file:
+            for line in trials_file:
+                try:
+                    trial = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(f"Skipping incomplete trial in {self.trials_path}")
+                    continue
+                if trial.get("search_key") == self.search_key_:
+                    completed[_trial_key(trial["params"], trial["fold"])] = trial
+        if line and not line.endswith('\n'):
+            # Start the next trial on a new line after the cut-off one
+            with open(self.trials_path, 'a', encoding='utf-8') as trials_file:
+                trials_file.write('\n')
+        if completed:
+            logging.info(f"Resuming search with {len(completed)} completed trials from {self.trials_path}")
+        return completed
+
+    def save_trial(self, trial: dict) -> None:
+        """Record a completed trial and append it to trials_path.
+
+        Every trial is flushed to disk on its own, so an interrupted search loses at
+        most the fold that was being fitted.
+
+        Args:
+            trial (dict): params, fold, score and fit_time of the trial
+        """
+        # Folds grown in parallel threads save their trials concurrently
+        with self.trials_lock:
+            self.trials.append(trial)
+            if not self.trials_path:
+                return
+            os.makedirs(os.path.dirname(self.trials_path) or '.', exist_ok=True)
+            with open(self.trials_path, 'a', encoding='utf-8') as trials_file:
+                trials_file.write(json.dumps({"search_key": self.search_key_, **trial}) + '\n')
+                trials_file.flush()
+                os.fsync(trials_file.fileno())
+
+    def budgeted_search(self, X_train: ndarray, y_train: ndarray) -> None:
+        """
+        Search param_grid within a budget, growing every forest across the n_estimators values.
+
+        Each candidate (a combination of the other parameters) is fitted once per fold with
+        warm_start and grown rung by rung through the sorted n_estimators values. "halving"
+        keeps the best 1 / factor of the candidates after every rung, so only the most
+        promising ones reach the largest forests. "random" grows the candidates in random
+        order through all rungs. Both stop once time_budget_s is used up, checked before
+        every fold (a fold that is already running is finished); the best configuration is
+        refitted on the whole training set. Halving takes it from the last rung that was
+        completed rather than from all rungs, and builds the fold forests of a candidate
+        when it is first grown and drops them once the candidate is eliminated.
+        tuning["n_jobs"] folds are grown concurrently.
+
+        With tuning["trials_path"] every trial is appended to that file, and a search that
+        is started again on the same data skips the trials found there.
+
+        Parameters:
+        - X_train (ndarray): Training data.
+        - y_train (ndarray): Target values.
+        """
+        tuning = self.config['tuning']
+        strategy = tuning.get('strategy', 'halving')
+        factor = tuning.get('factor', 3)
+        time_budget_s = tuning.get('time_budget_s')
+        scorer = get_scorer(tuning.get('scoring', 'accuracy'))
+        rungs = sorted(self.config["param_grid"].get('n_estimators', [self.config['n_estimators']]))
+        y_train = np.asarray(y_train)
+        folds = list(StratifiedKFold(n_splits=tuning['cv'], shuffle=True,
+                                     random_state=tuning.get('random_state', self.config['random_state'])).split(X_train, y_train))
+
+        _, forest_jobs = self.fold_jobs(len(folds))
+
+        def make_forests(params):
+            forest = clone(self.model).set_params(**params, warm_start=True, oob_score=False, n_jobs=forest_jobs)
+            return [(clone(forest), train_index, validation_index) for train_index, validation_index in folds]
+
+        start = time.perf_counter()
+        deadline = None if time_budget_s is None else start + time_budget_s
+        self.trials = []
+        self.search_key_ = self.search_key(X_train, y_train)
+        self.completed_trials = self.load_trials()
+        results = []
+        # Halving picks the winner of the last completed rung, as HalvingGridSearchCV does
+        final_results = None
+        out_of_time = False
+        if strategy == 'halving':
+            # Forests are only built when their candidate is first grown
+            survivors = [(params, None) for params in self.candidates()]
+            for rung_index, n_estimators in enumerate(rungs):
+                scored = []
+                for params, forests in survivors:
+                    forests = forests or make_forests(params)
+                    score = self.grow(forests, params, n_estimators, X_train, y_train, scorer, deadline)
+                    if score is None:
+                        out_of_time = True
+                        break
+                    results.append(({**params, "n_estimators": n_estimators}, score))
+                    scored.append((score, params, forests))
+                if not out_of_time:
+                    final_results = results[-len(scored):]
+                if out_of_time or rung_index == len(rungs) - 1:
+                    break
+                scored.sort(key=lambda entry: entry[0], reverse=True)
+                survivors = [(params, forests) for _, params, forests in scored[:max(1, math.ceil(len(scored) / factor))]]
+                # Release the forests of the eliminated candidates before the next rung grows the survivors
+                del scored
+        else:
+            for params in self.candidates():
+                forests = make_forests(params)
+                for n_estimators in rungs:
+                    score = self.grow(forests, params, n_estimators, X_train, y_train, scorer, deadline)
+                    if score is None:
+                        out_of_time = True
+                        break
+                    results.append(({**params, "n_estimators": n_estimators}, score))
+                if out_of_time:
+                    break
+        if not results:
+            raise RuntimeError("time_budget_s is too small to evaluate a single configuration")
+
+        self.results_ = results
+        self.best_params_, self.best_score_ = max(final_results or results, key=lambda result: result[1])
+        self.best_estimator_ = clone(self.model).set_params(**self.best_params_).fit(X_train, y_train)
+        print(f'Evaluated {len(results)} configurations in {time.perf_counter() - start:.1f} s \n Best Parameter: {self.best_params_} \n Best Score: {self.best_score_}')
 
     def get_score(self, X_test: ndarray, y_test: ndarray) -> float:
         """ Get the model accuracy
@@ -55,4 +332,3 @@ class RandomForestOptimizer (Model):
             float: Floating value of oob_score_
         """
         return self.model.oob_score_ 
-    
\ No newline at end of file
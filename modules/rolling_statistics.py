@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+
+# Features produced by RollingStatistics, named like the tsfresh calculators
+ROLLING_FEATURES = (
+    "sum_values",
+    "mean",
+    "variance",
+    "standard_deviation",
+    "root_mean_square",
+    "abs_energy",
+    "minimum",
+    "maximum",
+    "absolute_sum_of_changes",
+    "mean_abs_change",
+    "mean_change",
+)
+
+class RollingStatistics:
+    """
+    Statistics of every window position in one linear pass over a continuous signal.
+
+    Sums are read from cumulative sums, so each window costs O(1) regardless of how
+    much consecutive windows overlap. Minimum and maximum use scipy's running
+    min/max filters, which keep a monotonic queue of candidates (O(N) in total).
+    The windows are the ones SignalPreprocessor.window_matrix produces for the same
+    signal: window i starts at sample i * hop_size_points, incomplete windows are dropped.
+    """
+
+    def __init__(self, window_size_points: int, hop_size_points: int = None):
+        """
+        Initialize the rolling statistics.
+
+        :param window_size_points: Number of samples per window.
+        :param hop_size_points: Number of samples between window starts (default: window_size_points).
+        """
+        self.window_size_points = window_size_points
+        self.hop_size_points = hop_size_points or window_size_points
+        if not 0 < self.hop_size_points <= self.window_size_points:
+            raise ValueError("hop_size_points must be positive and not larger than window_size_points")
+
+    @classmethod
+    def from_preprocessor(cls, preprocessor) -> 'RollingStatistics':
+        """
+        Use the window and hop size of a SignalPreprocessor (at its output rate).
+        """
+        return cls(preprocessor.window_size_points, preprocessor.hop_size_points)
+
+    def window_starts(self, n_samples: int) -> np.ndarray:
+        """First sample of every complete window."""
+        if n_samples < self.window_size_points:
+            return np.empty(0, dtype=np.int64)
+        return np.arange(0, n_samples - self.window_size_points + 1, self.hop_size_points)
+
+    @staticmethod
+    def window_sums(values: np.ndarray, starts: np.ndarray, length: int) -> np.ndarray:
+        """Sum of values[start:start + length] for every start, from one cumulative sum."""
+        cumulative = np.concatenate(([0.0], np.cumsum(values)))
+        return cumulative[starts + length] - cumulative[starts]
+
+    def compute(self, signal, kind: str = 'data_filtered') -> pd.DataFrame:
+        """
+        Compute ROLLING_FEATURES for every window of the signal.
+
+        With continuous_filter (or decimation) in SignalPreprocessor, pass the
+        signal from SignalPreprocessor.filter_signal; the values then match the
+        tsfresh features of the saved windows.
+
+        :param signal: The filtered signal of one measurement.
+        :param kind: Name of the signal, used as column prefix like tsfresh's kind.
+        :return: DataFrame with one row per window, indexed by window id.
+        """
+        signal = np.asarray(signal, dtype=np.float64)
+        length = self.window_size_points
+        starts = self.window_starts(len(signal))
+        if len(starts) == 0:
+            return pd.DataFrame(columns=[f"{kind}__{name}" for name in ROLLING_FEATURES], dtype=float)
+
+        # Centering on the global mean keeps the cumulative sums small and the variance accurate
+        offset = signal.mean()
+        centered = signal - offset
+        centered_sum = self.window_sums(centered, starts, length)
+        centered_squares = self.window_sums(centered ** 2, starts, length)
+        centered_mean = centered_sum / length
+        mean = centered_mean + offset
+        variance = np.maximum(centered_squares / length - centered_mean ** 2, 0.0)
+        abs_energy = centered_squares + 2 * offset * centered_sum + length * offset ** 2
+
+        # The running filters are centered: output i covers signal[i - length // 2:i - length // 2 + length]
+        minimum = minimum_filter1d(signal, length)[starts + length // 2]
+        maximum = maximum_filter1d(signal, length)[starts + length // 2]
+
+        if length > 1:
+            absolute_sum_of_changes = self.window_sums(np.abs(np.diff(signal)), starts, length - 1)
+            mean_abs_change = absolute_sum_of_changes / (length - 1)
+            mean_change = (signal[starts + length - 1] - signal[starts]) / (length - 1)
+        else:
+            absolute_sum_of_changes = np.zeros(len(starts))
+            mean_abs_change = mean_change = np.full(len(starts), np.nan)
+
+        features = {
+            "sum_values": mean * length,
+            "mean": mean,
+            "variance": variance,
+            "standard_deviation": np.sqrt(variance),
+            "root_mean_square": np.sqrt(np.maximum(abs_energy, 0.0) / length),
+            "abs_energy": abs_energy,
+            "minimum": minimum,
+            "maximum": maximum,
+            "absolute_sum_of_changes": absolute_sum_of_changes,
+            "mean_abs_change": mean_abs_change,
+            "mean_change": mean_change,
+        }
+        return pd.DataFrame({f"{kind}__{name}": features[name] for name in ROLLING_FEATURES},
+                            index=pd.RangeIndex(len(starts), name='id'))
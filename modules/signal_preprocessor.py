@@ -1,8 +1,36 @@
 import pandas as pd
 import numpy as np
 import os
+import json
 from sklearn.preprocessing import MinMaxScaler
-from scipy.signal import butter, lfilter
+from fractions import Fraction
+from functools import lru_cache
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import butter, resample_poly, sosfilt
+
+# Verhältnis von Ziel-Abtastrate zu Grenzfrequenz bei automatischer Dezimierung
+# (Nyquist-Faktor 2 plus Übergangsbereich des Anti-Aliasing-Filters)
+DECIMATION_OVERSAMPLING = 2.5
+
+
+@lru_cache(maxsize=None)
+def butter_lowpass_sos(order: int, cutoff_hz: float, sampling_rate_hz: float) -> np.ndarray:
+    """
+    Entwirft einen Butterworth-Tiefpass in Second-Order-Sections-Form.
+    Die Koeffizienten werden je (Ordnung, Grenzfrequenz, Abtastrate) nur einmal berechnet.
+
+    Args:
+        order (int): Die Ordnung des Filters.
+        cutoff_hz (float): Grenzfrequenz in Hz.
+        sampling_rate_hz (float): Abtastrate in Hz.
+
+    Returns:
+        np.ndarray: Filterkoeffizienten der Form (n_sections, 6); das Array wird geteilt und darf nicht verändert werden.
+    """
+    nyq = 0.5 * sampling_rate_hz
+    normal_cutoff = cutoff_hz / nyq
+    return butter(order, normal_cutoff, btype='low', analog=False, output='sos')
+
 
 class SignalPreprocessor:
     """
@@ -12,11 +40,20 @@ class SignalPreprocessor:
         window_length_ms (int): Länge des Fensters in Millisekunden für die Segmentierung.
         sampling_rate_hz (int): Abtastrate in Hertz.
         cutoff_hz (int): Grenzfrequenz für den Tiefpassfilter.
+        hop_length_ms (int): Abstand zwischen den Anfängen aufeinanderfolgender Fenster in Millisekunden.
         window_size_points (int): Anzahl der Messpunkte pro Fenster.
+        hop_size_points (int): Anzahl der Messpunkte zwischen zwei Fensteranfängen.
+        continuous_filter (bool): Filtert die Messung am Stück statt jedes Fenster einzeln.
+        decimation_rate_hz (float): Abtastrate nach der Dezimierung oder None ohne Dezimierung.
+        output_rate_hz (float): Abtastrate der vorverarbeiteten Fenster.
+        output_format (str): Speicherformat der vorverarbeiteten Daten ('csv' oder 'npy').
+        output_dtype (str): Datentyp der Fenster im Binärformat ('float64' oder 'float32').
         scaler (MinMaxScaler): Instanz des Scalers zur Normalisierung der Daten.
     """
     
-    def __init__(self, window_length_ms: int = 100, sampling_rate_hz: int = 10000, cutoff_hz: int = 150):
+    def __init__(self, window_length_ms: int = 100, sampling_rate_hz: int = 10000, cutoff_hz: int = 40,
+                 continuous_filter: bool = False, hop_length_ms: int = None, decimation_rate_hz=None,
+                 output_format: str = 'csv', output_dtype: str = 'float64'):
         """
         Initialisiert den SignalPreprocessor mit den gegebenen Parametern.
 
@@ -24,13 +61,79 @@ class SignalPreprocessor:
             window_length_ms (int): Länge des Fensters in Millisekunden.
             sampling_rate_hz (int): Abtastrate in Hz.
             cutoff_hz (int): Grenzfrequenz für den Tiefpassfilter in Hz.
+            continuous_filter (bool): Wenn True, wird der Filterzustand über Fenstergrenzen
+                hinweg beibehalten, sodass nicht jedes Fenster mit einem Einschwingvorgang beginnt.
+            hop_length_ms (int): Abstand der Fensteranfänge in Millisekunden. Standardmäßig
+                gleich window_length_ms (lückenlose, nicht überlappende Fenster); kleinere
+                Werte erzeugen überlappende Fenster.
+            decimation_rate_hz (float | str): Ziel-Abtastrate einer optionalen Dezimierung nach
+                dem Tiefpassfilter. 'auto' leitet sie aus der Grenzfrequenz ab, None deaktiviert
+                die Dezimierung. Fenstergröße und Zeitachse beziehen sich dann auf die neue Rate.
+            output_format (str): 'csv' für die bisherige Textausgabe, 'npy' für eine Fenstermatrix
+                mit JSON-Sidecar, die ohne Parsen speicherabgebildet geladen werden kann.
+            output_dtype (str): Datentyp der Fenstermatrix im Format 'npy'.
         """
         self.window_length_ms = window_length_ms
         self.sampling_rate_hz = sampling_rate_hz
         self.cutoff_hz = cutoff_hz
-        self.window_size_points = int((sampling_rate_hz / 1000) * window_length_ms)
+        self.continuous_filter = continuous_filter
+        self.hop_length_ms = hop_length_ms or window_length_ms
+        self.decimation_rate_hz = self.resolve_decimation_rate(decimation_rate_hz)
+        self.output_rate_hz = self.decimation_rate_hz or sampling_rate_hz
+        if output_format not in ('csv', 'npy'):
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self.output_format = output_format
+        self.output_dtype = output_dtype
+        self.window_size_points = int(round((self.output_rate_hz / 1000) * window_length_ms))
+        self.hop_size_points = int(round((self.output_rate_hz / 1000) * self.hop_length_ms))
+        if not 0 < self.hop_size_points <= self.window_size_points:
+            raise ValueError("hop_length_ms must be positive and not larger than window_length_ms")
         self.scaler = MinMaxScaler(feature_range=(0, 1))
 
+    @classmethod
+    def from_config(cls, settings: dict) -> 'SignalPreprocessor':
+        """
+        Erzeugt einen SignalPreprocessor aus config.json["signal_preprocessing"].
+        Ausführungsparameter wie n_workers und rolling_statistics werden dabei ignoriert.
+        """
+        return cls(**{key: value for key, value in settings.items() if key not in ('n_workers', 'rolling_statistics')})
+
+    def resolve_decimation_rate(self, decimation_rate_hz):
+        """
+        Bestimmt die Ziel-Abtastrate der Dezimierung. Bei 'auto' wird die Abtastrate
+        ganzzahlig so weit reduziert, dass sie mindestens DECIMATION_OVERSAMPLING mal
+        der Grenzfrequenz entspricht.
+
+        Returns:
+            float: Ziel-Abtastrate in Hz oder None, wenn nicht dezimiert wird.
+        """
+        if decimation_rate_hz is None:
+            return None
+        if decimation_rate_hz == 'auto':
+            factor = max(1, int(self.sampling_rate_hz // (DECIMATION_OVERSAMPLING * self.cutoff_hz)))
+            decimation_rate_hz = self.sampling_rate_hz / factor
+        if not 0 < decimation_rate_hz <= self.sampling_rate_hz:
+            raise ValueError("decimation_rate_hz must be positive and not larger than sampling_rate_hz")
+        if decimation_rate_hz < 2 * self.cutoff_hz:
+            raise ValueError("decimation_rate_hz must be at least twice cutoff_hz to avoid aliasing")
+        return decimation_rate_hz
+
+    def decimate(self, data):
+        """
+        Reduziert die Abtastrate eines (bereits tiefpassgefilterten) Signals per
+        Polyphasen-Resampling mit integriertem Anti-Aliasing-FIR-Filter.
+
+        Args:
+            data (array_like): Das Signal mit sampling_rate_hz.
+
+        Returns:
+            np.ndarray: Das Signal mit output_rate_hz.
+        """
+        if not self.decimation_rate_hz:
+            return np.asarray(data)
+        ratio = Fraction(self.decimation_rate_hz / self.sampling_rate_hz).limit_denominator(1000)
+        return resample_poly(data, ratio.numerator, ratio.denominator)
+
     def butter_lowpass_filter(self, data, order=5):
         """
         Wendet einen Butterworth-Tiefpassfilter auf die Daten an.
@@ -42,13 +145,101 @@ class SignalPreprocessor:
         Returns:
             array_like: Die gefilterten Daten.
         """
-        self.cutoff_hz = 40
-        nyq = 0.5 * self.sampling_rate_hz
-        normal_cutoff = self.cutoff_hz / nyq
-        b, a = butter(order, normal_cutoff, btype='low', analog=False)
-        y = lfilter(b, a, data)
-        return y
+        sos = butter_lowpass_sos(order, self.cutoff_hz, self.sampling_rate_hz)
+        return sosfilt(sos, data)
+
+    def filter_signal(self, data, order=5):
+        """
+        Filtert die gesamte Messung am Stück und dezimiert sie gegebenenfalls auf output_rate_hz.
+
+        Args:
+            data (array_like): Das Signal mit sampling_rate_hz.
+            order (int): Die Ordnung des Filters.
+
+        Returns:
+            np.ndarray: Das gefilterte Signal mit output_rate_hz.
+        """
+        return self.decimate(self.butter_lowpass_filter(data, order))
+
+    def filter_windows(self, windows, order=5):
+        """
+        Filtert alle Fenster einer Fenstermatrix in einem vektorisierten Aufruf entlang der
+        Sample-Achse. Jedes Fenster wird wie bei butter_lowpass_filter unabhängig gefiltert.
+
+        Args:
+            windows (array_like): Fenstermatrix der Form (n_fenster, window_size_points).
+            order (int): Die Ordnung des Filters.
+
+        Returns:
+            np.ndarray: Die gefilterten Fenster in derselben Form.
+        """
+        sos = butter_lowpass_sos(order, self.cutoff_hz, self.sampling_rate_hz)
+        return sosfilt(sos, windows, axis=-1)
+
+
+    def window_matrix(self, signal, partial: str = 'drop', pad_value: float = 0.0):
+        """
+        Zerlegt ein Signal in Fenster als 2-D-Array der Form (n_fenster, window_size_points).
+        Aufeinanderfolgende Fenster beginnen jeweils hop_size_points Messpunkte später.
+
+        Für vollständige Fenster ist das Ergebnis eine schreibgeschützte Sicht (View) auf das
+        Signal, es werden also keine Daten kopiert, auch nicht bei überlappenden Fenstern.
+        Das unvollständige letzte Fenster beginnt am nächsten Fensteranfang und existiert nur,
+        wenn es Messpunkte enthält, die das letzte vollständige Fenster nicht abdeckt (bei
+        überlappenden Fenstern liegt der Rest sonst vollständig im letzten Fenster). Es wird je
+        nach partial behandelt:
+            'drop': verwerfen,
+            'pad': mit pad_value auffüllen und als letzte Zeile anhängen (erzeugt eine Kopie),
+            'separate': getrennt zurückgeben, Rückgabe ist dann (fenster, rest).
+
+        Args:
+            signal (array_like): Eindimensionales Signal.
+            partial (str): Behandlung des unvollständigen letzten Fensters.
+            pad_value (float): Füllwert für partial='pad'.
+
+        Returns:
+            np.ndarray oder Tuple[np.ndarray, np.ndarray]: Die Fenstermatrix (und ggf. der Rest).
+        """
+        if partial not in ('drop', 'pad', 'separate'):
+            raise ValueError(f"Unbekannte Behandlung des letzten Fensters: {partial}")
+        signal = np.asarray(signal)
+        size = self.window_size_points
+        hop = self.hop_size_points
+        n_windows = self.count_windows(len(signal))
+        if n_windows > 0:
+            windows = sliding_window_view(signal, size)[::hop]
+        else:
+            windows = np.empty((0, size), dtype=signal.dtype)
+        covered = (n_windows - 1) * hop + size if n_windows > 0 else 0
+        remainder = signal[n_windows * hop:] if len(signal) > covered else signal[:0]
+
+        if partial == 'separate':
+            return windows, remainder
+        if partial == 'pad' and len(remainder) > 0:
+            padded = np.full(size, pad_value, dtype=np.result_type(signal.dtype, np.asarray(pad_value).dtype))
+            padded[:len(remainder)] = remainder
+            return np.vstack([windows, padded])
+        return windows
+
+    def count_windows(self, n_samples: int) -> int:
+        """
+        Anzahl der vollständigen Fenster in einem Signal mit n_samples Messpunkten.
+        """
+        if n_samples < self.window_size_points:
+            return 0
+        return (n_samples - self.window_size_points) // self.hop_size_points + 1
 
+    def window_start_times(self, window_ids) -> np.ndarray:
+        """
+        Startzeitpunkte der Fenster in Sekunden relativ zum Beginn der Messung.
+
+        Args:
+            window_ids (array_like): Fenster-IDs, wie sie in der Spalte 'id' gespeichert werden.
+
+        Returns:
+            np.ndarray: Startzeitpunkte in Sekunden.
+        """
+        return np.asarray(window_ids) * self.hop_length_ms / 1000
 
     def segment_into_windows(self, data: pd.DataFrame) -> [pd.DataFrame]:
         """
@@ -62,11 +253,13 @@ class SignalPreprocessor:
         """
         windows = []
         total_samples = len(data)
-        for start_index in range(0, total_samples, self.window_size_points):
+        for start_index in range(0, total_samples, self.hop_size_points):
             end_index = min(start_index + self.window_size_points, total_samples)
             window = data.iloc[start_index:end_index]
             if not window.empty:
                 windows.append(window)
+            if end_index == total_samples:
+                break
         return windows
 
     def preprocess(self, data: pd.DataFrame) -> [pd.DataFrame]:
@@ -78,23 +271,59 @@ class SignalPreprocessor:
 
         Returns:
             List[pd.DataFrame]: Liste von DataFrames, jedes repräsentiert ein vorverarbeitetes Fenster.
+            Die Spalte 'id' enthält die fortlaufende Fenster-ID, aus der sich mit
+            window_start_times() der Startzeitpunkt des Fensters ergibt.
+        """
+        time_windows, filtered_windows, time_tail, filtered_tail = self.preprocess_matrix(data)
+
+        preprocessed_windows = [
+            pd.DataFrame({'id': window_id, 'time': time_window, 'data_filtered': filtered})
+            for window_id, (time_window, filtered) in enumerate(zip(time_windows, filtered_windows))
+        ]
+        if len(time_tail) > 0:
+            preprocessed_windows.append(pd.DataFrame({'id': len(time_windows), 'time': time_tail, 'data_filtered': filtered_tail}))
+        return preprocessed_windows
+
+    def preprocess_matrix(self, data: pd.DataFrame):
+        """
+        Verarbeitet die gegebenen Daten als Fenstermatrix: alle vollständigen Fenster werden
+        in einem Aufruf gefiltert, das unvollständige letzte Fenster separat. Mit
+        continuous_filter wird stattdessen die gesamte Messung gefiltert und danach segmentiert.
+        Mit Dezimierung wird die gefilterte Messung vor der Segmentierung auf output_rate_hz
+        reduziert und die Zeitachse entsprechend neu berechnet.
+
+        Args:
+            data (pd.DataFrame): Die zu verarbeitenden Daten mit den Spalten 'data' und 'time'.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Zeitmatrix, gefilterte
+            Fenstermatrix sowie Zeit und gefilterte Werte des unvollständigen letzten Fensters.
         """
         if 'data' not in data.columns or 'time' not in data.columns:
             raise ValueError("Data for preprocessing must include 'data' and 'time' columns")
 
-        preprocessed_windows = []
-        windows = self.segment_into_windows(data)
-    
-        for window in windows:
-            filtered = self.butter_lowpass_filter(window['data'].values)
-            #normalized = self.scaler.fit_transform(filtered.reshape(-1, 1)).flatten()
-            preprocessed_window = pd.DataFrame({
-                'time': np.round(window['time'].reset_index(drop=True), 4),
-                #'data_filtered_normalized': normalized
-                'data_filtered': filtered
-            })
-            preprocessed_windows.append(preprocessed_window)
-        return preprocessed_windows
+        signal = data['data'].to_numpy(dtype=float)
+        time = data['time'].to_numpy()
+        if self.decimation_rate_hz:
+            signal = self.filter_signal(signal)
+            time = time[0] + np.arange(len(signal)) / self.output_rate_hz if len(time) > 0 else time
+        time_windows, time_tail = self.window_matrix(np.round(time, 4), partial='separate')
+        if self.decimation_rate_hz:
+            filtered_windows, filtered_tail = self.window_matrix(signal, partial='separate')
+        elif self.continuous_filter:
+            filtered_windows, filtered_tail = self.window_matrix(self.filter_signal(signal), partial='separate')
+        else:
+            windows, tail = self.window_matrix(signal, partial='separate')
+            filtered_windows = self.filter_windows(windows)
+            filtered_tail = self.butter_lowpass_filter(tail) if len(tail) > 0 else tail
+        #normalized = self.scaler.fit_transform(filtered.reshape(-1, 1)).flatten()
+        return time_windows, filtered_windows, time_tail, filtered_tail
+
+    def streaming(self, order=5) -> 'StreamingPreprocessor':
+        """
+        Erzeugt einen StreamingPreprocessor mit denselben Parametern.
+        """
+        return StreamingPreprocessor(self, order=order)
 
     def save_preprocessed_data(self, preprocessed_windows, experiment_name, measurement_name):
         """
@@ -110,3 +339,192 @@ class SignalPreprocessor:
         save_path = f'{save_directory}/{experiment_name}_{measurement_name}.csv'
         pd.concat(preprocessed_windows, ignore_index=True).to_csv(save_path, index=False)
         print(f"Preprocessed data saved to {save_path}")
+
+    def save_preprocessed_matrix(self, time_windows, filtered_windows, experiment_name, measurement_name, order=5,
+                                 time_tail=None, filtered_tail=None):
+        """
+        Speichert die gefilterte Fenstermatrix binär als .npy-Datei und die Parameter der
+        Vorverarbeitung in einer JSON-Sidecar-Datei daneben. Die Zeitachse wird nicht
+        gespeichert, sondern beim Laden aus Startzeit, Fensterabstand und Abtastrate abgeleitet.
+        Ein unvollständiges letztes Fenster wird wie im CSV-Format behalten: es steht als
+        letzte, mit NaN aufgefüllte Zeile in der Matrix, seine Länge im Sidecar unter
+        'partial_window_points' (0, wenn es keines gibt).
+
+        Args:
+            time_windows (np.ndarray): Zeitmatrix aus preprocess_matrix.
+            filtered_windows (np.ndarray): Gefilterte Fenstermatrix aus preprocess_matrix.
+            experiment_name (str): Der Name des Experiments.
+            measurement_name (str): Der Name der Messung.
+            order (int): Die verwendete Ordnung des Filters.
+            time_tail (np.ndarray): Zeitwerte des unvollständigen letzten Fensters aus preprocess_matrix.
+            filtered_tail (np.ndarray): Gefilterte Werte des unvollständigen letzten Fensters.
+        """
+        save_directory = '.data/preprocessed'
+        os.makedirs(save_directory, exist_ok=True)
+        save_path = f'{save_directory}/{experiment_name}_{measurement_name}.npy'
+        partial_window_points = 0 if filtered_tail is None else len(filtered_tail)
+        matrix = np.ascontiguousarray(filtered_windows, dtype=self.output_dtype)
+        if partial_window_points > 0:
+            padded_tail = np.full((1, self.window_size_points), np.nan, dtype=self.output_dtype)
+            padded_tail[0, :partial_window_points] = filtered_tail
+            matrix = np.vstack([matrix.reshape(-1, self.window_size_points), padded_tail])
+        np.save(save_path, matrix)
+
+        if len(time_windows) > 0:
+            start_time = float(time_windows[0, 0])
+        else:
+            start_time = float(time_tail[0]) if partial_window_points > 0 else 0.0
+        metadata = {
+            'experiment': experiment_name,
+            'measurement': measurement_name,
+            'n_windows': int(len(matrix)),
+            'partial_window_points': int(partial_window_points),
+            'start_time': start_time,
+            'window_length_ms': self.window_length_ms,
+            'hop_length_ms': self.hop_length_ms,
+            'window_size_points': self.window_size_points,
+            'hop_size_points': self.hop_size_points,
+            'sampling_rate_hz': self.sampling_rate_hz,
+            'output_rate_hz': self.output_rate_hz,
+            'cutoff_hz': self.cutoff_hz,
+            'filter_order': order,
+            'continuous_filter': self.continuous_filter,
+            'decimation_rate_hz': self.decimation_rate_hz,
+            'dtype': self.output_dtype,
+        }
+        with open(save_path[:-len('.npy')] + '.json', 'w') as sidecar_file:
+            json.dump(metadata, sidecar_file, indent=2)
+        print(f"Preprocessed data saved to {save_path}")
+
+    @staticmethod
+    def load_preprocessed_matrix(file_path, mmap: bool = True):
+        """
+        Lädt eine mit save_preprocessed_matrix gespeicherte Fenstermatrix samt Sidecar.
+
+        Args:
+            file_path (str | Path): Pfad der .npy-Datei.
+            mmap (bool): Wenn True, wird die Matrix speicherabgebildet statt eingelesen.
+
+        Returns:
+            Tuple[np.ndarray, dict]: Fenstermatrix und Parameter der Vorverarbeitung.
+        """
+        file_path = str(file_path)
+        windows = np.load(file_path, mmap_mode='r' if mmap else None)
+        with open(file_path[:-len('.npy')] + '.json', 'r') as sidecar_file:
+            metadata = json.load(sidecar_file)
+        return windows, metadata
+
+    @staticmethod
+    def iter_window_blocks(windows, metadata, block_windows: int = 10000):
+        """
+        Liefert die Fenstermatrix blockweise als (Id des ersten Fensters, Block). Die Blöcke
+        vollständiger Fenster sind Ausschnitte der speicherabgebildeten Matrix, sodass immer
+        nur ein Block im Speicher liegt. Ein unvollständiges letztes Fenster wird zuletzt als
+        eigener Block der Form (1, partial_window_points) ohne die NaN-Auffüllung geliefert.
+
+        Args:
+            windows (np.ndarray): Fenstermatrix aus load_preprocessed_matrix.
+            metadata (dict): Parameter der Vorverarbeitung aus der Sidecar-Datei.
+            block_windows (int): Anzahl der Fenster pro Block.
+
+        Yields:
+            Tuple[int, np.ndarray]: Id des ersten Fensters und Fensterblock.
+        """
+        partial_window_points = metadata.get('partial_window_points', 0)
+        n_complete = len(windows) - (1 if partial_window_points > 0 else 0)
+        for start in range(0, n_complete, block_windows):
+            yield start, windows[start:min(start + block_windows, n_complete)]
+        if partial_window_points > 0:
+            yield n_complete, windows[n_complete:, :partial_window_points]
+
+    @staticmethod
+    def windows_to_long_format(windows, metadata, first_window: int = 0) -> pd.DataFrame:
+        """
+        Wandelt eine Fenstermatrix oder einen Block aus iter_window_blocks in das Langformat
+        mit den Spalten 'id', 'time' und 'data_filtered' um, wie es auch im CSV-Format
+        gespeichert wird.
+
+        Args:
+            windows (np.ndarray): Fenster der Form (n_fenster, n_punkte).
+            metadata (dict): Parameter der Vorverarbeitung aus der Sidecar-Datei.
+            first_window (int): Id des ersten Fensters des Blocks.
+
+        Returns:
+            pd.DataFrame: Die Fenster im Langformat.
+        """
+        n_windows, window_size = windows.shape
+        window_ids = np.arange(first_window, first_window + n_windows)
+        sample_index = (window_ids[:, None] * metadata['hop_size_points'] + np.arange(window_size)).ravel()
+        return pd.DataFrame({
+            'id': np.repeat(window_ids, window_size),
+            'time': np.round(metadata['start_time'] + sample_index / metadata['output_rate_hz'], 4),
+            'data_filtered': np.asarray(windows).ravel(),
+        })
+
+
+class StreamingPreprocessor:
+    """
+    Vorverarbeitung eines fortlaufenden Signals in beliebig großen Blöcken.
+
+    Der Zustand des Tiefpassfilters (zi) wird zwischen den Blöcken beibehalten. Dadurch ist
+    die Ausgabe bitgleich zur Filterung der gesamten Messung am Stück, unabhängig davon, wie
+    das Signal in Blöcke aufgeteilt wird. Speicherbedarf und Latenz hängen nur von der
+    Blockgröße ab.
+
+    Attribute:
+        preprocessor (SignalPreprocessor): Liefert Fensterlänge, Abtastrate und Grenzfrequenz.
+        sos (np.ndarray): Filterkoeffizienten in Second-Order-Sections-Form.
+        zi (np.ndarray): Aktueller Filterzustand.
+    """
+
+    def __init__(self, preprocessor: SignalPreprocessor, order=5):
+        """
+        Initialisiert den StreamingPreprocessor.
+
+        Args:
+            preprocessor (SignalPreprocessor): Der zugrundeliegende SignalPreprocessor.
+            order (int): Die Ordnung des Filters.
+        """
+        if preprocessor.decimation_rate_hz:
+            raise ValueError("StreamingPreprocessor does not support decimation")
+        self.preprocessor = preprocessor
+        self.sos = butter_lowpass_sos(order, preprocessor.cutoff_hz, preprocessor.sampling_rate_hz)
+        self.reset()
+
+    def reset(self):
+        """
+        Setzt den Filterzustand und den Puffer unvollständiger Fenster zurück.
+        """
+        self.zi = np.zeros((self.sos.shape[0], 2))
+        self.pending = np.empty(0)
+
+    def filter(self, chunk):
+        """
+        Filtert den nächsten Block des Signals und übernimmt den Filterzustand in den nächsten Aufruf.
+
+        Args:
+            chunk (array_like): Der nächste Block des Signals.
+
+        Returns:
+            np.ndarray: Die gefilterten Werte des Blocks.
+        """
+        filtered, self.zi = sosfilt(self.sos, np.asarray(chunk, dtype=float), zi=self.zi)
+        return filtered
+
+    def push(self, chunk):
+        """
+        Filtert den nächsten Block und liefert alle dadurch vervollständigten Fenster.
+        Übrige Werte werden bis zum nächsten Aufruf gepuffert.
+
+        Args:
+            chunk (array_like): Der nächste Block des Signals.
+
+        Returns:
+            np.ndarray: Gefilterte Fenstermatrix der Form (n_fenster, window_size_points), ggf. leer.
+        """
+        buffered = np.concatenate([self.pending, self.filter(chunk)])
+        windows = self.preprocessor.window_matrix(buffered)
+        # Gepuffert wird ab dem nächsten Fensteranfang, auch wenn diese Werte schon in
+        # einem überlappenden Fenster enthalten waren
+        self.pending = buffered[len(windows) * self.preprocessor.hop_size_points:]
+        return windows
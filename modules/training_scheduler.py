@@ -0,0 +1,130 @@
+import os
+import tempfile
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from numpy import ndarray
+
+from .learner import Learner
+
+def split_core_budget(configs: Dict[str, dict], n_cores: int) -> Dict[str, int]:
+    """Split a core budget among the learners.
+
+    Every learner gets one core; the remaining cores go to the learners that can use
+    several cores for fitting (see Learner.PARALLEL_ALGORITHMS), in equal shares.
+    With fewer cores than learners only n_cores learners run at once (see
+    TrainingScheduler.concurrent_learners), so the cores in use never exceed the budget.
+
+    Args:
+        configs (dict): learner configs by name
+        n_cores (int): total number of cores to use
+
+    Returns:
+        dict: number of cores per learner
+    """
+    budget = {name: 1 for name in configs}
+    parallel = [name for name, config in configs.items() if config["name"] in Learner.PARALLEL_ALGORITHMS]
+    spare = max(n_cores - len(configs), 0)
+    for index, name in enumerate(parallel):
+        budget[name] += spare // len(parallel) + (1 if index < spare % len(parallel) else 0)
+    return budget
+
+def memmap_dtype(config: dict) -> type:
+    """dtype of the shared training set for a learner.
+
+    Tree models convert X to float32 inside fit; a float64 memory map would make every
+    tree worker copy the whole training set, a float32 one is used in place.
+    """
+    return np.float32 if config["name"] in Learner.FLOAT32_ALGORITHMS else np.float64
+
+def fit_learner(config: dict, n_jobs: int, X_path: str, columns: list, y_train: ndarray) -> Tuple[Learner, float]:
+    """Fit one learner on the memory-mapped training features (runs in a worker process).
+
+    Args:
+        config (dict): config of the learner
+        n_jobs (int): number of cores the learner may use
+        X_path (str): path of the .npy file holding X_train
+        columns (list): feature names of X_train, or None for plain arrays
+        y_train (ndarray): target values
+
+    Returns:
+        Tuple[Learner, float]: the trained learner and its fit time in seconds
+    """
+    X_train = np.load(X_path, mmap_mode='r')
+    if columns is not None:
+        # Wrapping the memory map keeps the feature names without copying the data
+        X_train = pd.DataFrame(X_train, columns=columns, copy=False)
+    learner = Learner(config={**config, "n_jobs": n_jobs})
+    start = time.perf_counter()
+    learner.train(X_train=X_train, Y_train=y_train)
+    return learner, time.perf_counter() - start
+
+class TrainingScheduler:
+    """Fits several learners concurrently on one shared training set.
+
+    X_train is written once per dtype to a .npy file that every worker opens as a read-only
+    memory map, so the workers share the pages instead of receiving a copy each. Tree
+    learners get a float32 copy, which they use without converting (see memmap_dtype).
+    """
+
+    def __init__(self, configs: Dict[str, dict], n_cores: int = -1, memmap_directory: str = None) -> None:
+        """Initializes the scheduler
+
+        Args:
+            configs (dict): config["algorithms"]; entries that are no Learner algorithm (e.g. the optimizer) are skipped
+            n_cores (int, optional): global core budget, -1 uses all cores. Defaults to -1.
+            memmap_directory (str, optional): directory for the memory-mapped training set. Defaults to the temp directory.
+        """
+        self.configs = {name: config for name, config in configs.items() if config["name"] in Learner.ALGORITHMS}
+        self.n_cores = os.cpu_count() if n_cores is None or n_cores < 1 else n_cores
+        self.memmap_directory = memmap_directory
+        self.fit_times = {}
+        self.wall_clock_time = None
+
+    def concurrent_learners(self) -> int:
+        """Number of learners fitted at the same time: all of them, or one per core if there are fewer cores."""
+        return max(1, min(len(self.configs), self.n_cores))
+
+    def fit_all(self, X_train, y_train) -> Dict[str, Learner]:
+        """Fits all learners concurrently within the core budget.
+
+        Args:
+            X_train (DataFrame | ndarray): features for training data
+            y_train (ndarray): target values
+
+        Returns:
+            dict: the trained learners by config name
+        """
+        budget = split_core_budget(self.configs, self.n_cores)
+        columns = list(X_train.columns) if isinstance(X_train, pd.DataFrame) else None
+        y_train = np.asarray(y_train)
+        if self.memmap_directory:
+            os.makedirs(self.memmap_directory, exist_ok=True)
+
+        start = time.perf_counter()
+        with tempfile.TemporaryDirectory(dir=self.memmap_directory) as tmp_dir:
+            X_paths = {}
+            for dtype in {memmap_dtype(config) for config in self.configs.values()}:
+                X_paths[dtype] = os.path.join(tmp_dir, f'X_train_{np.dtype(dtype).name}.npy')
+                np.save(X_paths[dtype], np.ascontiguousarray(np.asarray(X_train, dtype=dtype)))
+            results = Parallel(n_jobs=self.concurrent_learners())(
+                delayed(fit_learner)(config, budget[name], X_paths[memmap_dtype(config)], columns, y_train)
+                for name, config in self.configs.items())
+        self.wall_clock_time = time.perf_counter() - start
+
+        learners = {}
+        for name, (learner, fit_time) in zip(self.configs, results):
+            learners[name] = learner
+            self.fit_times[name] = fit_time
+        return learners
+
+    def report(self) -> None:
+        """Prints the fit time of every learner and the wall-clock time of the concurrent run."""
+        for name, fit_time in self.fit_times.items():
+            print(f"{name}: fit in {fit_time:.2f} s")
+        total = sum(self.fit_times.values())
+        print(f"Wall-clock: {self.wall_clock_time:.2f} s, sum of fit times: {total:.2f} s "
+              f"(speedup {total / self.wall_clock_time:.2f}x)")
@@ -0,0 +1,329 @@
+import logging
+from functools import cached_property
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy.signal import welch
+from tsfresh.utilities.string_manipulation import convert_to_output_format
+
+def _simple(function):
+    """Wrap a calculator without parameters so that it returns a single unnamed result."""
+    def calculator(windows: np.ndarray, param: List[dict]) -> List[Tuple[str, np.ndarray]]:
+        return [("", function(windows))]
+    return calculator
+
+def _per_parameter(function):
+    """Wrap a calculator that is evaluated once per parameter dictionary, like tsfresh does."""
+    def calculator(windows: np.ndarray, param: List[dict]) -> List[Tuple[str, np.ndarray]]:
+        return [(convert_to_output_format(p), function(windows, **p)) for p in param]
+    return calculator
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator != 0, numerator / np.where(denominator != 0, denominator, 1), np.nan)
+
+def _length(windows):
+    return np.full(len(windows), windows.shape[1], dtype=float)
+
+def _mean_change(windows):
+    if windows.shape[1] < 2:
+        return np.full(len(windows), np.nan)
+    return (windows[:, -1] - windows[:, 0]) / (windows.shape[1] - 1)
+
+def _mean_second_derivative_central(windows):
+    if windows.shape[1] < 3:
+        return np.full(len(windows), np.nan)
+    return (windows[:, -1] - windows[:, -2] - windows[:, 1] + windows[:, 0]) / (2 * (windows.shape[1] - 2))
+
+def _count_relative_to_mean(windows, above: bool):
+    mean = windows.mean(axis=1, keepdims=True)
+    return ((windows > mean) if above else (windows < mean)).sum(axis=1).astype(float)
+
+def _standardized_moment(windows, order: int):
+    # Bias-corrected skewness and excess kurtosis as computed by pandas (and therefore tsfresh)
+    n = windows.shape[1]
+    deviations = windows - windows.mean(axis=1, keepdims=True)
+    m2 = (deviations ** 2).mean(axis=1)
+    if order == 3:
+        if n < 3:
+            return np.full(len(windows), np.nan)
+        m3 = (deviations ** 3).mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5
+    else:
+        if n < 4:
+            return np.full(len(windows), np.nan)
+        m4 = (deviations ** 4).mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            g2 = m4 / m2 ** 2
+            result = (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * g2 - 3 * (n - 1))
+    # pandas returns 0 for (numerically) constant windows
+    return np.where(np.isclose(m2, 0, atol=1e-14), 0.0, result)
+
+def _quantile(windows, q):
+    return np.quantile(windows, q, axis=1)
+
+def _autocorrelation(windows, lag):
+    n = windows.shape[1]
+    if n <= lag:
+        return np.full(len(windows), np.nan)
+    deviations = windows - windows.mean(axis=1, keepdims=True)
+    sum_product = (deviations[:, :n - lag] * deviations[:, lag:]).sum(axis=1)
+    variance = windows.var(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(np.isclose(variance, 0), np.nan, sum_product / ((n - lag) * variance))
+
+def _number_peaks(windows, n):
+    length = windows.shape[1]
+    if length <= 2 * n:
+        return np.zeros(len(windows))
+    centre = windows[:, n:length - n]
+    is_peak = np.ones(centre.shape, dtype=bool)
+    for shift in range(1, n + 1):
+        is_peak &= centre > windows[:, n - shift:length - n - shift]
+        is_peak &= centre > windows[:, n + shift:length - n + shift]
+    return is_peak.sum(axis=1).astype(float)
+
+def _ratio_beyond_r_sigma(windows, r):
+    deviations = np.abs(windows - windows.mean(axis=1, keepdims=True))
+    return (deviations > r * windows.std(axis=1, keepdims=True)).sum(axis=1) / windows.shape[1]
+
+def _energy_ratio_by_chunks(windows, param):
+    squared = windows ** 2
+    cumulative = np.concatenate([np.zeros((len(windows), 1)), np.cumsum(squared, axis=1)], axis=1)
+    total = cumulative[:, -1]
+    length = windows.shape[1]
+    results = []
+    for p in param:
+        num_segments, segment_focus = p["num_segments"], p["segment_focus"]
+        # Segment bounds of np.array_split: the first (length % num_segments) segments are one longer
+        size, remainder = divmod(length, num_segments)
+        start = segment_focus * size + min(segment_focus, remainder)
+        stop = start + size + (1 if segment_focus < remainder else 0)
+        values = _safe_divide(cumulative[:, stop] - cumulative[:, start], total)
+        results.append((convert_to_output_format(p), values))
+    return results
+
+def _location(windows, function, last: bool):
+    n = windows.shape[1]
+    if last:
+        return 1.0 - function(windows[:, ::-1], axis=1) / n
+    return function(windows, axis=1) / n
+
+# Vectorized counterparts of the tsfresh feature calculators, keyed by the tsfresh name
+CALCULATORS = {
+    "sum_values": _simple(lambda w: w.sum(axis=1)),
+    "mean": _simple(lambda w: w.mean(axis=1)),
+    "median": _simple(lambda w: np.median(w, axis=1)),
+    "standard_deviation": _simple(lambda w: w.std(axis=1)),
+    "variance": _simple(lambda w: w.var(axis=1)),
+    "maximum": _simple(lambda w: w.max(axis=1)),
+    "minimum": _simple(lambda w: w.min(axis=1)),
+    "absolute_maximum": _simple(lambda w: np.abs(w).max(axis=1)),
+    "root_mean_square": _simple(lambda w: np.sqrt((w ** 2).mean(axis=1))),
+    "abs_energy": _simple(lambda w: np.einsum('ij,ij->i', w, w)),
+    "length": _simple(_length),
+    "absolute_sum_of_changes": _simple(lambda w: np.abs(np.diff(w, axis=1)).sum(axis=1)),
+    "mean_abs_change": _simple(lambda w: np.abs(np.diff(w, axis=1)).mean(axis=1)),
+    "mean_change": _simple(_mean_change),
+    "mean_second_derivative_central": _simple(_mean_second_derivative_central),
+    "count_above_mean": _simple(lambda w: _count_relative_to_mean(w, above=True)),
+    "count_below_mean": _simple(lambda w: _count_relative_to_mean(w, above=False)),
+    "variation_coefficient": _simple(lambda w: _safe_divide(w.std(axis=1), w.mean(axis=1))),
+    "skewness": _simple(lambda w: _standardized_moment(w, 3)),
+    "kurtosis": _simple(lambda w: _standardized_moment(w, 4)),
+    "first_location_of_maximum": _simple(lambda w: _location(w, np.argmax, last=False)),
+    "last_location_of_maximum": _simple(lambda w: _location(w, np.argmax, last=True)),
+    "first_location_of_minimum": _simple(lambda w: _location(w, np.argmin, last=False)),
+    "last_location_of_minimum": _simple(lambda w: _location(w, np.argmin, last=True)),
+    "quantile": _per_parameter(_quantile),
+    "autocorrelation": _per_parameter(_autocorrelation),
+    "number_peaks": _per_parameter(_number_peaks),
+    "ratio_beyond_r_sigma": _per_parameter(_ratio_beyond_r_sigma),
+    "energy_ratio_by_chunks": _energy_ratio_by_chunks,
+}
+
+class SpectralBank:
+    """
+    Transforms of a window matrix shared by all spectral features.
+
+    Each transform is computed at most once for the whole matrix, on first use,
+    instead of once per feature calculator and window as in tsfresh.
+    """
+
+    def __init__(self, windows: np.ndarray, sampling_rate_hz: Union[float, None] = None):
+        """
+        :param windows: Array of shape (n_windows, window_length).
+        :param sampling_rate_hz: Sampling rate of the windows, needed for the band powers.
+        """
+        self.windows = windows
+        self.sampling_rate_hz = sampling_rate_hz
+
+    @cached_property
+    def spectrum(self) -> np.ndarray:
+        """Real FFT of every window."""
+        return np.fft.rfft(self.windows, axis=1)
+
+    @cached_property
+    def magnitude(self) -> np.ndarray:
+        return np.abs(self.spectrum)
+
+    @cached_property
+    def welch_density(self) -> np.ndarray:
+        """Welch power spectral density with the segment length tsfresh uses."""
+        return welch(self.windows, nperseg=min(self.windows.shape[1], 256), axis=1)[1]
+
+    @cached_property
+    def periodogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        """One-sided power spectral density (in unit^2/Hz) over the full window length, and its frequencies."""
+        if self.sampling_rate_hz is None:
+            raise ValueError("Band powers require the sampling rate of the windows.")
+        n = self.windows.shape[1]
+        density = self.magnitude ** 2 / (self.sampling_rate_hz * n)
+        # Every bin except DC (and Nyquist for even lengths) also holds the negative frequency
+        density[:, 1:(n + 1) // 2] *= 2
+        return np.fft.rfftfreq(n, d=1 / self.sampling_rate_hz), density
+
+def _fft_coefficient(bank, param):
+    aggregations = {
+        "real": lambda coeff: bank.spectrum[:, coeff].real,
+        "imag": lambda coeff: bank.spectrum[:, coeff].imag,
+        "abs": lambda coeff: bank.magnitude[:, coeff],
+        "angle": lambda coeff: np.angle(bank.spectrum[:, coeff], deg=True),
+    }
+    results = []
+    for p in param:
+        if p["attr"] not in aggregations or p["coeff"] < 0:
+            raise ValueError(f"Unsupported fft_coefficient parameters: {p}")
+        if p["coeff"] < bank.spectrum.shape[1]:
+            values = aggregations[p["attr"]](p["coeff"])
+        else:
+            values = np.full(len(bank.windows), np.nan)
+        results.append((convert_to_output_format(p), values))
+    return results
+
+def _fft_aggregated(bank, param):
+    # Moments of the magnitude spectrum seen as a distribution over the bin index, as in tsfresh
+    magnitude = bank.magnitude
+    bins = np.arange(magnitude.shape[1], dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total = magnitude.sum(axis=1)
+        moments = {k: magnitude @ bins ** k / total for k in range(1, 5)}
+        centroid = moments[1]
+        variance = moments[2] - centroid ** 2
+        # tsfresh returns NaN below a variance of half a bin
+        resolved = variance >= 0.5
+        aggregations = {
+            "centroid": centroid,
+            "variance": variance,
+            "skew": np.where(resolved, (moments[3] - 3 * centroid * variance - centroid ** 3) / variance ** 1.5, np.nan),
+            # Same expression as tsfresh (including its "- 3 * centroid" term) to keep the columns interchangeable
+            "kurtosis": np.where(resolved, (moments[4] - 4 * centroid * moments[3] + 6 * moments[2] * centroid ** 2
+                                            - 3 * centroid) / variance ** 2, np.nan),
+        }
+    results = []
+    for p in param:
+        if p["aggtype"] not in aggregations:
+            raise ValueError(f"Unsupported fft_aggregated parameters: {p}")
+        results.append((convert_to_output_format(p), aggregations[p["aggtype"]]))
+    return results
+
+def _spkt_welch_density(bank, param):
+    density = bank.welch_density
+    return [(convert_to_output_format(p),
+             density[:, p["coeff"]] if p["coeff"] < density.shape[1] else np.full(len(density), np.nan))
+            for p in param]
+
+def _band_power(bank, param, relative: bool = False):
+    frequencies, density = bank.periodogram
+    resolution = frequencies[1] - frequencies[0] if len(frequencies) > 1 else bank.sampling_rate_hz
+    total = density.sum(axis=1) * resolution
+    results = []
+    for p in param:
+        in_band = (frequencies >= p["f_low"]) & (frequencies < p["f_high"])
+        power = density[:, in_band].sum(axis=1) * resolution
+        results.append((convert_to_output_format(p), _safe_divide(power, total) if relative else power))
+    return results
+
+# Spectral calculators, all derived from one SpectralBank per window matrix
+SPECTRAL_CALCULATORS = {
+    "fft_coefficient": _fft_coefficient,
+    "fft_aggregated": _fft_aggregated,
+    "spkt_welch_density": _spkt_welch_density,
+    "band_power": _band_power,
+    "relative_band_power": lambda bank, param: _band_power(bank, param, relative=True),
+}
+
+# Calculators that only exist in the native engine (tsfresh cannot compute these columns)
+NATIVE_ONLY_CALCULATORS = ("band_power", "relative_band_power")
+
+def band_power_parameters(band_edges_hz: List[float]) -> Dict:
+    """
+    Settings for the absolute and relative power of consecutive frequency bands.
+
+    :param band_edges_hz: Increasing band edges, e.g. [0, 10, 20, 30, 40] for four 10 Hz bands.
+    """
+    bands = [{"f_low": low, "f_high": high} for low, high in zip(band_edges_hz[:-1], band_edges_hz[1:])]
+    return {"band_power": bands, "relative_band_power": bands}
+
+def supported_fc_parameters(fc_parameters: Dict) -> Dict:
+    """
+    Restrict tsfresh settings to the calculators available in the native engine.
+
+    :param fc_parameters: tsfresh settings, e.g. ComprehensiveFCParameters().
+    :return: The supported part of the settings.
+    """
+    return {name: param for name, param in fc_parameters.items()
+            if name in CALCULATORS or name in SPECTRAL_CALCULATORS}
+
+class WindowFeatureCalculator:
+    """
+    Computes a subset of the tsfresh features directly on a window matrix.
+
+    Every feature is evaluated for all windows at once with NumPy operations along
+    the sample axis, so fixed-length windows do not need to be converted to the long
+    format and grouped per id. Column names and values match tsfresh for the
+    calculators listed in CALCULATORS and SPECTRAL_CALCULATORS, except for the
+    band powers, which tsfresh does not provide.
+    """
+
+    def __init__(self, fc_parameters: Dict, sampling_rate_hz: Union[float, None] = None):
+        """
+        Initialize the calculator.
+
+        :param fc_parameters: tsfresh-style settings mapping calculator names to parameter lists (or None).
+        :param sampling_rate_hz: Sampling rate of the windows, required for the band powers.
+        """
+        unsupported = sorted(set(fc_parameters) - set(CALCULATORS) - set(SPECTRAL_CALCULATORS))
+        if unsupported:
+            logging.error(f"Feature calculators not available in the native engine: {unsupported}")
+            raise ValueError(f"Feature calculators not available in the native engine: {unsupported}")
+        self.fc_parameters = fc_parameters
+        self.sampling_rate_hz = sampling_rate_hz
+
+    def extract(self, windows: np.ndarray, kind: str = 'data_filtered') -> pd.DataFrame:
+        """
+        Compute the configured features for every window.
+
+        :param windows: Array of shape (n_windows, window_length).
+        :param kind: Name of the signal, used as column prefix like tsfresh's kind.
+        :return: DataFrame with one row per window and columns in the order of the settings, as in tsfresh.
+        """
+        windows = np.asarray(windows, dtype=np.float64)
+        if windows.ndim != 2:
+            raise ValueError("windows must be a 2-dimensional array of shape (n_windows, window_length).")
+
+        bank = SpectralBank(windows, self.sampling_rate_hz)
+        columns = {}
+        for name, param in self.fc_parameters.items():
+            if name in SPECTRAL_CALCULATORS:
+                results = SPECTRAL_CALCULATORS[name](bank, param)
+            else:
+                results = CALCULATORS[name](windows, param)
+            for key, values in results:
+                feature_name = f"{kind}__{name}"
+                if key:
+                    feature_name += f"__{key}"
+                columns[feature_name] = values
+        return pd.DataFrame(columns, index=pd.RangeIndex(len(windows)))
@@ -0,0 +1,66 @@
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the path to the DataLoader script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from modules.data_loader import DataLoader
+
+def legacy_load_file(file_path: Path, file_type: str) -> pd.DataFrame:
+    """
+    Reference implementation of the former DataLoader.load_file parsing path
+    (per-cell Python converter plus a string replace on the whole column).
+    """
+    sep = '\t' if file_type == 'tsv' else ','
+    data = pd.read_csv(file_path, sep=sep, converters={'RawData': lambda x: x.replace(',', '.')})
+    data.rename(columns={data.columns[0]: 'data'}, inplace=True)
+    data['data'] = data['data'].astype(str).str.replace(',', '.').astype(float)
+    return data
+
+def write_sample_file(directory: Path, file_type: str, n_samples: int) -> Path:
+    """
+    Writes a synthetic measurement shaped like the raw data: a single 'RawData'
+    column with decimal commas (TSV as in experiment1, quoted CSV as in experiment2).
+    """
+    rng = np.random.default_rng(42)
+    values = np.char.replace(np.round(rng.normal(0, 1, n_samples), 6).astype(str), '.', ',')
+    if file_type == 'csv':
+        values = np.char.add(np.char.add('"', values), '"')
+    file_path = directory / f'measurement_1.{file_type}'
+    file_path.write_text('RawData\n' + '\n'.join(values) + '\n')
+    return file_path
+
+def measure_throughput(load, file_path: Path, repeats: int) -> float:
+    """
+    Returns the best observed throughput of `load` in MB/s.
+    """
+    size_mb = file_path.stat().st_size / 1e6
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load()
+        best = min(best, time.perf_counter() - start)
+    return size_mb / best
+
+def main(n_samples: int = 2_000_000, repeats: int = 3):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+        config_path = tmp_dir / 'config.json'
+        config_path.write_text(json.dumps({'experiments': {}}))
+        data_loader = DataLoader(str(config_path))
+
+        for experiment, file_type in [('experiment1', 'tsv'), ('experiment2', 'csv')]:
+            file_path = write_sample_file(tmp_dir, file_type, n_samples)
+            legacy = measure_throughput(lambda: legacy_load_file(file_path, file_type), file_path, repeats)
+            current = measure_throughput(lambda: data_loader.parse_file(file_path, file_type, experiment), file_path, repeats)
+            print(f"{experiment} ({file_type}, {file_path.stat().st_size / 1e6:.1f} MB): "
+                  f"legacy {legacy:.1f} MB/s, current {current:.1f} MB/s, speedup {current / legacy:.1f}x")
+
+if __name__ == "__main__":
+    n_samples = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    main(n_samples)
@@ -4,16 +4,19 @@ import sys
 from pathlib import Path
 import os
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-from modules.data_loader import DataLoader
+from modules.data_loader import DataLoader, SAMPLING_RATE_HZ
+from modules.measurement_store import MeasurementStore
 
 def main():
-    # Initialize the DataLoader and load all experiment data
+    # Initialize the DataLoader
     data_loader = DataLoader('config.json')
-    full_data = data_loader.load_experiment_data()  # Assuming this method loads all data if no argument is provided
 
-    # Save the combined data to a CSV file in the ".data" folder
-    full_data.to_csv('.data/full_dataframe.csv', index=False)
-    print("All data has been successfully saved to '.data/full_dataframe.csv'.")
+    # Stream all experiment data measurement by measurement into the indexed
+    # measurement store in the ".data" folder, so only one measurement is held in memory
+    store = MeasurementStore('.data/measurement_store', sampling_rate_hz=SAMPLING_RATE_HZ)
+    store.write((experiment, measurement, data['data'].to_numpy())
+                for experiment, measurement, data in data_loader.iter_measurements())
+    print(f"All data has been successfully saved to '{store.directory}'.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,25 +3,79 @@ import pandas as pd
 from pathlib import Path
 import sys
 import os
+import time
 
 # Add the path to the DataLoader, SignalPreprocessor, and FeatureExtractor scripts
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from modules.feature_extractor import FeatureExtractor
+from modules.signal_preprocessor import SignalPreprocessor
 
-def process_file(preprocessed_file_path, extracted_features_directory, feature_extractor):
-    # Load preprocessed data
-    data = pd.read_csv(preprocessed_file_path)
-    
-    data['id'] = data.index // 1000  # Assign an ID based on 1000 samples per window
+def load_preprocessed_data(preprocessed_file_path):
+    # Load preprocessed data in the long format with 'id', 'time' and 'data_filtered' columns
+    if preprocessed_file_path.suffix == '.npy':
+        windows, metadata = SignalPreprocessor.load_preprocessed_matrix(preprocessed_file_path)
+        return pd.concat([SignalPreprocessor.windows_to_long_format(block, metadata, first_window)
+                          for first_window, block in SignalPreprocessor.iter_window_blocks(windows, metadata)],
+                         ignore_index=True)
 
-    # Extract features
-    features = feature_extractor.extract_features(data)
+    data = pd.read_csv(preprocessed_file_path)
+    if 'id' not in data.columns:
+        # Files written before window ids were stored: assume back-to-back windows of 1000 samples
+        data['id'] = data.index // 1000
+    return data
 
+def save_features(features, preprocessed_file_path, extracted_features_directory):
     # Save extracted features with the same naming convention
-    features_save_path = extracted_features_directory / preprocessed_file_path.name
+    features_save_path = extracted_features_directory / preprocessed_file_path.with_suffix('.csv').name
     features.to_csv(features_save_path, index=False)
-    print(f"Features extracted and saved to {features_save_path}")
+    return features_save_path
+
+def process_file(preprocessed_file_path, extracted_features_directory, feature_extractor):
+    start = time.perf_counter()
+    # Binary window matrices are memory-mapped and streamed to the extractor block by block
+    if preprocessed_file_path.suffix == '.npy':
+        windows, metadata = SignalPreprocessor.load_preprocessed_matrix(preprocessed_file_path)
+        block_windows = feature_extractor.config['feature_extraction'].get('block_windows', 10000)
+        features = feature_extractor.extract_window_blocks(
+            SignalPreprocessor.iter_window_blocks(windows, metadata, block_windows),
+            sampling_rate_hz=metadata['output_rate_hz'])
+    else:
+        # Extract features
+        features = feature_extractor.extract_features(load_preprocessed_data(preprocessed_file_path))
+    elapsed = time.perf_counter() - start
+
+    features_save_path = save_features(features, preprocessed_file_path, extracted_features_directory)
+    print(f"Features extracted and saved to {features_save_path} "
+          f"({len(features)} windows in {elapsed:.1f} s, {len(features) / elapsed:.1f} windows/s)")
+
+def process_batch(preprocessed_file_paths, extracted_features_directory, feature_extractor):
+    # Extract all files in one tsfresh run so that they share a single worker pool
+    frames = [load_preprocessed_data(path) for path in preprocessed_file_paths]
+    start = time.perf_counter()
+    features_per_file = feature_extractor.extract_features_batch(frames)
+    elapsed = time.perf_counter() - start
+
+    n_windows = sum(len(features) for features in features_per_file)
+    for preprocessed_file_path, features in zip(preprocessed_file_paths, features_per_file):
+        features_save_path = save_features(features, preprocessed_file_path, extracted_features_directory)
+        print(f"Features extracted and saved to {features_save_path} ({len(features)} windows)")
+    print(f"Batch of {len(frames)} files: {n_windows} windows in {elapsed:.1f} s, {n_windows / elapsed:.1f} windows/s")
+
+def list_preprocessed_files(preprocessed_data_directory, preferred_format='csv'):
+    # A measurement left over in both formats would write the same features file twice,
+    # so only the file in the configured output format is used
+    preprocessed_files = {}
+    for pattern in ('*.csv', '*.npy'):
+        for preprocessed_file in sorted(preprocessed_data_directory.glob(pattern)):
+            other = preprocessed_files.get(preprocessed_file.stem)
+            if other is None or preprocessed_file.suffix == f'.{preferred_format}':
+                if other is not None:
+                    print(f"Skipping {other.name}: {preprocessed_file.name} is in the configured output format")
+                preprocessed_files[preprocessed_file.stem] = preprocessed_file
+            else:
+                print(f"Skipping {preprocessed_file.name}: {other.name} is in the configured output format")
+    return sorted(preprocessed_files.values(), key=lambda path: (path.suffix != '.csv', path.name))
 
 def main(file_to_process=None):
     # Define the path to the preprocessed data directory and extracted features directory
@@ -41,8 +95,14 @@ def main(file_to_process=None):
             print(f"File {file_to_process} not found in {preprocessed_data_directory}.")
     else:
         # Process all files in the preprocessed data directory
-        for preprocessed_file in preprocessed_data_directory.glob('*.csv'):
-            process_file(preprocessed_file, extracted_features_directory, feature_extractor)
+        output_format = feature_extractor.config.get('signal_preprocessing', {}).get('output_format', 'csv')
+        preprocessed_files = list_preprocessed_files(preprocessed_data_directory, output_format)
+        cross_file_batching = feature_extractor.config['feature_extraction'].get('cross_file_batching', False)
+        if cross_file_batching and feature_extractor.engine == "tsfresh" and preprocessed_files:
+            process_batch(preprocessed_files, extracted_features_directory, feature_extractor)
+        else:
+            for preprocessed_file in preprocessed_files:
+                process_file(preprocessed_file, extracted_features_directory, feature_extractor)
 
 if __name__ == "__main__":
     file_to_process = sys.argv[1] if len(sys.argv) > 1 else None
@@ -1,4 +1,9 @@
 import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from modules.measurement_store import MeasurementStore
 
 def load_measurement_data(experiment_name: str, measurement_name: str = None) -> pd.DataFrame:
     """
@@ -11,22 +16,11 @@ def load_measurement_data(experiment_name: str, measurement_name: str = None) ->
     Returns:
     - pd.DataFrame: Data for the specified experiment or measurement.
     """
-    # Define the path to the full dataframe
-    full_dataframe_path = '.data/full_dataframe.csv'
-    
-    # Load the full dataframe
-    full_data = pd.read_csv(full_dataframe_path)
-
-    # Filter the dataframe for the specified experiment
-    if measurement_name:
-        # Filter for a specific measurement within the experiment
-        specific_data = full_data[(full_data['experiment'] == experiment_name) & 
-                                  (full_data['measurement'] == measurement_name)]
-    else:
-        # Load all measurements for the specified experiment
-        specific_data = full_data[full_data['experiment'] == experiment_name]
+    # Open the indexed measurement store written by data_extraction.py
+    store = MeasurementStore('.data/measurement_store')
 
-    return specific_data
+    # Only the requested measurement(s) are read from disk
+    return store.load(experiment_name, measurement_name)
 
 def main():
     # Specify the experiment name you want to load
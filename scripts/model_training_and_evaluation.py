@@ -15,8 +15,11 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from modules.learner import Learner
 from modules.evaluator import Evaluator
 from modules.data_loader import DataLoader
+from modules.feature_extractor import FeatureExtractor
+from modules.labeller import Labeller
+from modules.training_scheduler import TrainingScheduler
 
-def train_and_evaluate(learner: 'Learner', X_train: ndarray, X_test: ndarray, y_train: ndarray, y_test: ndarray, algorithm_ ='random_forest') -> None:
+def train_and_evaluate(learner: 'Learner', X_train: ndarray, X_test: ndarray, y_train: ndarray, y_test: ndarray, algorithm_ ='random_forest', train: bool = True, evaluator: 'Evaluator' = None, groups_train: ndarray = None, cv_settings: dict = None, oversample: bool = False) -> None:
     """Training and evaluating the models
     Args:
         learner (Learner): algorithm to be trained and evaluated
@@ -26,6 +29,11 @@ def train_and_evaluate(learner: 'Learner', X_train: ndarray, X_test: ndarray, y_
         y_test (ndarray): array containing the test true target values
         plots_dir (str): directory where the plots are to saved
         algorithm_ (str, optional): the name of the algorithm. Defaults to 'random_forest'.
+        train (bool, optional): fit the learner first; False for learners trained by the TrainingScheduler. Defaults to True.
+        evaluator (Evaluator, optional): evaluator holding the predictions of the trained learner on X_test. Created if None.
+        groups_train (ndarray, optional): measurement of every training sample for grouped cross validation folds.
+        cv_settings (dict, optional): cv, n_jobs and cache_directory of the cross validation (config["training"]["cross_validation"]).
+        oversample (bool, optional): X_train is not oversampled yet; the cross validation oversamples every fold's training part. Defaults to False.
     """
     print(f'*************************************************Training and evaluating {algorithm_}****************************************************')
 
@@ -34,17 +42,29 @@ def train_and_evaluate(learner: 'Learner', X_train: ndarray, X_test: ndarray, y_
     plots_dir = os.path.join(artifacts_dir, 'plots')
     models_dir = os.path.join(artifacts_dir, 'models')
 
-    learner.train(X_train=X_train, Y_train=y_train)
+    if train:
+        learner.train(X_train=X_train, Y_train=y_train)
 
-    learner.accuracy(X_test, y_test)
+    # Predictions and scores on the test set are computed once and shared by all metrics
+    if evaluator is None:
+        evaluator = Evaluator(learner.model, X_test, y_test)
 
-    learner.cross_validation(X_train=X_train, y_train=y_train)
+    learner.accuracy(X_test, y_test, predictions=evaluator.predictions)
+
+    cv_settings = cv_settings or {}
+    groups = groups_train if cv_settings.get('group_by_measurement', True) else None
+    cv_result = learner.cross_validation(X_train=X_train, y_train=y_train, groups=groups,
+                                         cv=cv_settings.get('cv', 10), n_jobs=cv_settings.get('n_jobs'),
+                                         cache_directory=cv_settings.get('cache_directory'), oversample=oversample)
+
+    # Out-of-fold metrics reuse the fold predictions instead of predicting again
+    print("Out-of-fold:")
+    Evaluator(None, None, y_train, predictions=cv_result['predictions'], scores=cv_result['probabilities']).evaluate_model()
 
-    evaluator = Evaluator(learner.model, X_test, y_test)
     evaluator.evaluate_model()
    
 
-    evaluator.plot_metrics(model = learner.model, X_test=X_test, y_test=y_test, plots_dir=plots_dir, algorithm_=algorithm_)
+    evaluator.plot_metrics(plots_dir=plots_dir, algorithm_=algorithm_)
     cm = evaluator.confusion_matrix()
     evaluator.plot_confusion_matrix(plots_dir=plots_dir, algorithm_= algorithm_, target_names=['Anomalie', 'Keine Anomalie'], conf_matrix=cm)
     #save the trained model
@@ -72,12 +92,15 @@ def main():
     # List of algorithm to configuration
     config = data_loader.config['algorithms']
 
-    features = pd.read_csv('.data/extracted_features/final_labeled_features_dataset.csv')
+    # Join the extracted features with the label sidecar written by labelling.py
+    features = Labeller.load_labelled_features('.data/extracted_features', data_loader.config['labelling']['labels_path'])
     
     print(features.head(5))
 
     features_df = features.drop(['label'], axis=1)
     target = features['label']
+    # The feature file (measurement) of every window, to keep measurements together in cross validation folds
+    groups = features.index.get_level_values('file').to_numpy()
   
     # Impute any missing values in the feature set
     impute(features_df)
@@ -85,20 +108,31 @@ def main():
     # Select only relevant features
     relevant_features = select_features(features_df, target)
 
-    # Apply Random Over Sampling to account for the imbalanced dataset
-    ros = RandomOverSampler(random_state=42)
-    X_resampled, y_resampled = ros.fit_resample(relevant_features, target)
+    # Persist the extraction settings for the selected features next to the models, so that
+    # extraction with the "kind_to_fc_parameters" profile only computes the features that matter
+    FeatureExtractor.save_kind_to_fc_parameters(relevant_features.columns,
+                                                data_loader.config['feature_extraction']['kind_to_fc_parameters_path'])
 
-    # Now split the resampled data
-    X_train, X_test, y_train, y_test = train_test_split(X_resampled, y_resampled, test_size=0.25, random_state=42)
+    # Split before oversampling, so that no duplicated minority row ends up in both training and test set
+    X_train, X_test, y_train, y_test, groups_train, _ = train_test_split(relevant_features, target, groups, test_size=0.25, random_state=42, stratify=target)
 
-    learner_random_forest = Learner(config=config["random_forest"])
-    learner_decision_tree = Learner(config=config["decision_tree"])
-    learner_knn = Learner(config=config["k_nearest_neighbors"])
-
-    train_and_evaluate(algorithm_=config["random_forest"]["name"], learner=learner_random_forest, X_train=X_train, y_train=y_train, X_test=X_test, y_test=y_test)
-    train_and_evaluate(algorithm_=config["decision_tree"]["name"], learner=learner_decision_tree, X_train=X_train, y_train=y_train, X_test=X_test, y_test=y_test)
-    train_and_evaluate(algorithm_=config["k_nearest_neighbors"]["name"], learner=learner_knn, X_train=X_train, y_train=y_train, X_test=X_test, y_test=y_test)
+    # Apply Random Over Sampling to the training set to account for the imbalanced dataset. The cross validation
+    # runs on the original rows and oversamples inside every fold, so each row is scored once at the real class ratio
+    ros = RandomOverSampler(random_state=42)
+    X_resampled, y_resampled = ros.fit_resample(X_train, y_train)
+
+    # Fit all configured learners concurrently, sharing X_train through a read-only memory map
+    training_config = data_loader.config.get('training', {})
+    scheduler = TrainingScheduler(config, n_cores=training_config.get('n_jobs', -1),
+                                  memmap_directory=training_config.get('memmap_directory'))
+    learners = scheduler.fit_all(X_resampled, y_resampled)
+    scheduler.report()
+
+    # Evaluate every trained learner against the same test set
+    evaluators = Evaluator.evaluate_models({name: learner.model for name, learner in learners.items()}, X_test, y_test)
+    for name, learner in learners.items():
+        train_and_evaluate(algorithm_=config[name]["name"], learner=learner, X_train=X_train, y_train=y_train, X_test=X_test, y_test=y_test, train=False, evaluator=evaluators[name], groups_train=groups_train, cv_settings=training_config.get('cross_validation'), oversample=True)
+    print(Evaluator.compare(evaluators))
 
 if __name__ == "__main__":
     main()
@@ -1,3 +1,6 @@
+import json
+import os
+import re
 import pandas as pd
 from pathlib import Path
 import sys
@@ -8,11 +11,36 @@ from tsfresh.utilities.dataframe_functions import impute
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from modules.optimizer import RandomForestOptimizer
 from modules.data_loader import DataLoader
+from modules.labeller import Labeller
+
+def save_best_parameter(config_path: str, best_parameter: dict) -> None:
+    """Write the best parameters of the search to config.json["algorithms"]["optimizer"]["best_parameter"].
+
+    Only the best_parameter entry is replaced, so the hand-written layout of the config
+    is kept; the file is replaced atomically, an interrupted write leaves the old config.
+    If the config has no flat best_parameter entry to replace, a ValueError is raised
+    and the file is left untouched instead of being reformatted.
+    """
+    with open(config_path, encoding='utf-8') as config_file:
+        text = config_file.read()
+    config = json.loads(text)
+    config["algorithms"]["optimizer"]["best_parameter"] = best_parameter
+
+    updated = re.sub(r'"best_parameter"\s*:\s*\{[^{}]*\}',
+                     lambda match: '"best_parameter": ' + json.dumps(best_parameter), text, count=1)
+    if json.loads(updated) != config:
+        raise ValueError(f'{config_path} has no "best_parameter" entry without nested objects in '
+                         f'"algorithms"."optimizer"; add it by hand: {json.dumps(best_parameter)}')
+    tmp_path = f"{config_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as config_file:
+        config_file.write(updated)
+    os.replace(tmp_path, config_path)
 
 def main():
      # Initialize DataLoader
     data_loader = DataLoader('config.json')
-    features = pd.read_csv('.data/extracted_features/final_labeled_features_dataset.csv')
+    # Join the extracted features with the label sidecar written by labelling.py
+    features = Labeller.load_labelled_features('.data/extracted_features', data_loader.config['labelling']['labels_path'])
 
     config = data_loader.config['algorithms']
     
@@ -31,21 +59,24 @@ def main():
     rf_optimizer  = RandomForestOptimizer(config=config["optimizer"])
     X_train, X_test, y_train, y_test  = rf_optimizer.split_data_set(relevant_features, target)
 
-    # Fit the model using grid search
-    rf_optimizer.train(X_train, y_train)
-
-    # Tuning the algorithm (Hyper Parameter Tuning). For time reason the next sentence is commented
-    # rf_optimizer.hyper_parameter_tuning(X_train, y_train)
+    # Tuning the algorithm (Hyper Parameter Tuning) within the time budget of config["tuning"].
+    # Completed trials are appended to tuning["trials_path"], so an interrupted run resumes where it stopped
+    rf_optimizer.hyper_parameter_tuning(X_train, y_train)
+    print(f"Best parameter: {rf_optimizer.best_params_}")
+    save_best_parameter('config.json', rf_optimizer.best_params_)
+    print("best_parameter written to config.json")
 
-    # Getting the accuracy of the model 
-    rf_score = rf_optimizer.get_score(X_test, y_test) 
+    # Getting the accuracy of the tuned model on the held-out split
+    best_estimator = rf_optimizer.best_estimator_
+    rf_score = best_estimator.score(X_test, y_test)
 
     # Round the accuracy
     acc_random_forest = round(rf_score * 100, 2)
 
     # Showing the accuracy
     print("Accuray:", acc_random_forest, "%")
-    print("oob score:", rf_optimizer.get_oob_score(), "%")
+    if hasattr(best_estimator, 'oob_score_'):
+        print("oob score:", best_estimator.oob_score_)
 
 if __name__ == "__main__":
     main()
@@ -3,51 +3,88 @@ import sys
 from pathlib import Path
 import os
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 
 # Add the path to the DataLoader script
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from modules.signal_preprocessor import SignalPreprocessor  # Update the import path as needed
+from modules.measurement_store import MeasurementStore
+from modules.rolling_statistics import RollingStatistics
+from modules.data_loader import DataLoader
 
-def load_full_data() -> pd.DataFrame:
+STORE_DIRECTORY = '.data/measurement_store'
+ROLLING_FEATURES_DIRECTORY = Path('.data/rolling_features')
+
+def load_store() -> MeasurementStore:
     """
-    Load the full DataFrame from the saved CSV file.
+    Open the indexed measurement store written by data_extraction.py.
     """
-    full_dataframe_path = '.data/full_dataframe.csv'
-    return pd.read_csv(full_dataframe_path)
+    return MeasurementStore(STORE_DIRECTORY)
 
 def preprocess_and_save(data: pd.DataFrame, experiment_name: str, measurement_name: str, preprocessor: SignalPreprocessor):
     """
-    Preprocess the data for a given experiment and measurement and save the results.
-    """
-    preprocessed_windows = preprocessor.preprocess(data)
-    preprocessor.save_preprocessed_data(preprocessed_windows, experiment_name, measurement_name)
-
-def main():
-    # Load the full experiment data
-    full_data = load_full_data()
-
-    # Initialize the signal preprocessor
-    preprocessor = SignalPreprocessor()
-
-    # Get unique experiment and measurement combinations
-    combinations = full_data[['experiment', 'measurement']].drop_duplicates()
-
-    for _, row in combinations.iterrows():
-        experiment_name = row['experiment']
-        measurement_name = row['measurement']
-        
-        # Filter data for the current experiment and measurement
-        specific_data = full_data[(full_data['experiment'] == experiment_name) & 
-                                  (full_data['measurement'] == measurement_name)].copy()
-
-        # Reset the time index for the measurement
-        specific_data = specific_data.copy()
-        specific_data['time'] = specific_data['time'] - specific_data['time'].iloc[0] 
-        
-        print(f"Processing {experiment_name} {measurement_name}...")
-        
-        # Preprocess and save the data
-        preprocess_and_save(specific_data, experiment_name, measurement_name, preprocessor)
+    Preprocess the data for a given experiment and measurement and save the results
+    in the configured output format.
+    """
+    if preprocessor.output_format == 'npy':
+        time_windows, filtered_windows, time_tail, filtered_tail = preprocessor.preprocess_matrix(data)
+        preprocessor.save_preprocessed_matrix(time_windows, filtered_windows, experiment_name, measurement_name,
+                                              time_tail=time_tail, filtered_tail=filtered_tail)
+    else:
+        preprocessed_windows = preprocessor.preprocess(data)
+        preprocessor.save_preprocessed_data(preprocessed_windows, experiment_name, measurement_name)
+
+def save_rolling_statistics(data: pd.DataFrame, experiment_name: str, measurement_name: str, preprocessor: SignalPreprocessor):
+    """
+    Compute the first-tier rolling statistics for every window of the measurement
+    in one pass over the continuously filtered signal and save them as CSV.
+    """
+    signal = preprocessor.filter_signal(data['data'].to_numpy(dtype=float))
+    features = RollingStatistics.from_preprocessor(preprocessor).compute(signal)
+    ROLLING_FEATURES_DIRECTORY.mkdir(parents=True, exist_ok=True)
+    features.to_csv(ROLLING_FEATURES_DIRECTORY / f'{experiment_name}_{measurement_name}.csv')
+
+def preprocess_measurement(store_directory: str, experiment_name: str, measurement_name: str, settings: dict) -> str:
+    """
+    Load, preprocess and save a single measurement.
+
+    Runs in a worker process: the measurement is memory-mapped from the store file,
+    so the signal is shared through the page cache instead of being pickled per task.
+    """
+    store = MeasurementStore(store_directory)
+    preprocessor = SignalPreprocessor.from_config(settings)
+
+    # Load only the current experiment and measurement
+    specific_data = store.load(experiment_name, measurement_name)
+
+    # Reset the time index for the measurement
+    specific_data['time'] = specific_data['time'] - specific_data['time'].iloc[0] 
+    
+    # Preprocess and save the data
+    preprocess_and_save(specific_data, experiment_name, measurement_name, preprocessor)
+    if settings.get('rolling_statistics', False):
+        save_rolling_statistics(specific_data, experiment_name, measurement_name, preprocessor)
+    return f"{experiment_name} {measurement_name}"
+
+def main(n_workers: int = None):
+    # Open the experiment data
+    store = load_store()
+
+    # Window and filter settings as well as the worker count come from the config
+    settings = DataLoader('config.json').config['signal_preprocessing']
+    n_workers = n_workers or settings.get('n_workers', 1)
+
+    # The store index already partitions the data by experiment and measurement
+    tasks = [(STORE_DIRECTORY, entry['experiment'], entry['measurement'], settings) for entry in store.entries()]
+
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [executor.submit(preprocess_measurement, *task) for task in tasks]
+            for future in futures:
+                print(f"Processed {future.result()}.")
+    else:
+        for task in tasks:
+            print(f"Processed {preprocess_measurement(*task)}.")
 
     print("All measurements have been preprocessed and saved.")
 
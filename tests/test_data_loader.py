@@ -7,7 +7,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from modules.data_loader import DataLoader
 import pandas as pd
+import numpy as np
 import os
+import json
 import logging
 from typing import Any, Dict, Union
 
@@ -51,3 +53,125 @@ def test_load_experiment_data(mock_json_load, mock_exists, mock_file):
     assert loaded_data["data"].dtype == "float64"
 
 # to execute the test, run "pytest" in the terminal
+
+def write_cached_config(tmp_path, measurement_path):
+    config = {
+        "experiments": {"experiment1": [{"path": str(measurement_path), "type": "tsv"}]},
+        "data_loading": {"use_cache": True, "cache_directory": str(tmp_path / "cache")},
+    }
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+    return str(config_path)
+
+def test_load_file_uses_cache_until_source_changes(tmp_path):
+    measurement_path = tmp_path / "measurement_1.tsv"
+    measurement_path.write_text("RawData\n1,5\n2,5\n")
+    loader = DataLoader(write_cached_config(tmp_path, measurement_path))
+
+    first = loader.load_file(measurement_path, "tsv", "experiment1")
+    with patch.object(DataLoader, "parse_file") as mock_parse:
+        second = loader.load_file(measurement_path, "tsv", "experiment1")
+        mock_parse.assert_not_called()
+    assert second["data"].tolist() == first["data"].tolist() == [1.5, 2.5]
+
+    # A modified source file invalidates the cache entry
+    measurement_path.write_text("RawData\n3,5\n4,5\n5,5\n")
+    os.utime(measurement_path, ns=(0, 0))
+    third = loader.load_file(measurement_path, "tsv", "experiment1")
+    assert third["data"].tolist() == [3.5, 4.5, 5.5]
+
+def test_load_file_returns_same_columns_on_cache_miss_and_hit(tmp_path):
+    measurement_path = tmp_path / "measurement_1.csv"
+    measurement_path.write_text("RawData;time\n1,5;0.1\n-2,25;0.2\n")
+    loader = DataLoader(write_cached_config(tmp_path, measurement_path))
+
+    miss = loader.load_file(measurement_path, "csv", "experiment1")
+    hit = loader.load_file(measurement_path, "csv", "experiment1")
+    assert list(miss.columns) == list(hit.columns) == ["data"]
+    pd.testing.assert_frame_equal(miss, hit)
+
+@pytest.mark.parametrize("content, file_type, expected_format", [
+    ("RawData\n1,5\n-2,25\n", "tsv", ("\t", ",")),
+    ("RawData;time\n1,5;0.1\n-2,25;0.2\n", "csv", (";", ",")),
+    ('RawData\n"1,5"\n"-2,25"\n', "csv", (",", ",")),
+])
+def test_parse_file_handles_decimal_commas(tmp_path, content, file_type, expected_format):
+    measurement_path = tmp_path / f"measurement_1.{file_type}"
+    measurement_path.write_text(content)
+    loader = DataLoader(write_cached_config(tmp_path, measurement_path))
+
+    assert loader.sniff_format(measurement_path, file_type) == expected_format
+    data = loader.parse_file(measurement_path, file_type, "experiment1")
+    assert data["data"].dtype == "float64"
+    assert data["data"].tolist() == [1.5, -2.25]
+
+def write_measurement_files(tmp_path, use_cache):
+    """Writes three TSV measurements and one pickle measurement plus a config using them."""
+    files = []
+    for index in range(3):
+        tsv_path = tmp_path / f"measurement_{index + 1}.tsv"
+        tsv_path.write_text("RawData\n" + "\n".join(f"{index},{i}" for i in range(5)) + "\n")
+        files.append({"path": tsv_path.name, "type": "tsv"})
+    pkl_path = tmp_path / "measurement_4.pkl"
+    pd.DataFrame({"RawData": [7.5, 8.5]}).to_pickle(pkl_path)
+    files.append({"path": pkl_path.name, "type": "pkl"})
+
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({
+        "experiments": {"experiment4": files},
+        "data_loading": {"use_cache": use_cache, "cache_directory": str(tmp_path / "cache")},
+    }))
+    return str(config_path)
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_parallel_loading_matches_sequential(tmp_path, monkeypatch, use_cache):
+    # Paths in the config are Windows-style and relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    loader = DataLoader(write_measurement_files(tmp_path, use_cache))
+
+    parallel = loader.load_experiment_data(n_workers=3)
+    sequential = loader.load_experiment_data(n_workers=1)
+
+    pd.testing.assert_frame_equal(sequential, parallel)
+    assert list(parallel.columns) == ["time", "data", "experiment", "measurement"]
+    assert parallel["measurement"].unique().tolist() == ["measurement_1", "measurement_2", "measurement_3", "measurement_4"]
+    assert parallel["data"].tolist()[-2:] == [7.5, 8.5]
+
+def test_assemble_measurements_releases_copied_values(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"experiments": {}}))
+    measurements = [("experiment1", "measurement_1", np.arange(3.0)), ("experiment1", "measurement_2", np.arange(2.0))]
+    data = DataLoader(str(config_path)).assemble_measurements(measurements)
+
+    assert data["data"].tolist() == [0.0, 1.0, 2.0, 0.0, 1.0]
+    assert [values for _, _, values in measurements] == [None, None]
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_iter_chunks_reassembles_full_data(tmp_path, monkeypatch, use_cache):
+    monkeypatch.chdir(tmp_path)
+    loader = DataLoader(write_measurement_files(tmp_path, use_cache))
+    full_data = loader.load_experiment_data()
+
+    measurements = list(loader.iter_measurements())
+    assert [measurement for _, measurement, _ in measurements] == ["measurement_1", "measurement_2", "measurement_3", "measurement_4"]
+
+    chunks = list(loader.iter_chunks(chunk_samples=2))
+    # Chunks never span two measurements: 3 x ceil(5 / 2) + 1
+    assert len(chunks) == 10
+    assert all(len(chunk) <= 2 for _, _, chunk in chunks)
+    streamed = pd.concat([chunk for _, _, chunk in chunks], ignore_index=True)
+    pd.testing.assert_frame_equal(streamed, full_data)
+
+def test_compact_mode_reduces_bytes_per_sample(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    loader = DataLoader(write_measurement_files(tmp_path, use_cache=False))
+    full_data = loader.load_experiment_data()
+    compact_data = loader.load_experiment_data(compact=True, data_dtype="float32")
+
+    assert list(compact_data.columns) == ["data", "experiment", "measurement"]
+    assert compact_data["data"].dtype == "float32"
+    assert compact_data["measurement"].dtype == "category"
+    assert compact_data["measurement"].astype(str).tolist() == full_data["measurement"].tolist()
+    np.testing.assert_allclose(compact_data["data"], full_data["data"], rtol=1e-6)
+    np.testing.assert_array_equal(DataLoader.time_axis(compact_data), full_data["time"])
+    assert DataLoader.bytes_per_sample(compact_data) < DataLoader.bytes_per_sample(full_data)
@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from modules.evaluator import Evaluator
+
+@pytest.fixture
+def test_set():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3))
+    y = (X[:, 0] + 0.5 * rng.normal(size=200) > 0).astype(int)
+    return X, y
+
+def test_single_inference_pass(test_set, tmp_path):
+    X, y = test_set
+    models = {
+        "random_forest": RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y),
+        "decision_tree": DecisionTreeClassifier(max_depth=3).fit(X, y),
+        "k_nearest_neighbors": KNeighborsClassifier(n_neighbors=3).fit(X, y),
+    }
+    for name, model in models.items():
+        expected = model.predict(X)
+        with mock.patch.object(model, "predict_proba", wraps=model.predict_proba) as predict_proba:
+            evaluator = Evaluator(model, X, y)
+            evaluator.evaluate_model()
+            evaluator.plot_metrics(algorithm_=name, plots_dir=str(tmp_path))
+        assert predict_proba.call_count == 1
+        np.testing.assert_array_equal(evaluator.predictions, expected)
+
+def test_compare_models(test_set):
+    X, y = test_set
+    models = {
+        "decision_tree": DecisionTreeClassifier(max_depth=1).fit(X, y),
+        "k_nearest_neighbors": KNeighborsClassifier(n_neighbors=3).fit(X, y),
+    }
+    metrics = Evaluator.compare(Evaluator.evaluate_models(models, X, y))
+
+    assert list(metrics.index) == ["decision_tree", "k_nearest_neighbors"]
+    assert list(metrics.columns) == ["Accuracy", "Precision", "Recall", "F1-Score", "MCC", "ROC-AUC", "PR-AUC"]
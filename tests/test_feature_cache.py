@@ -0,0 +1,60 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.feature_cache import FeatureCache
+from modules.feature_extractor import FeatureExtractor
+
+def create_test_data(n_windows=6, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'id': np.repeat(np.arange(n_windows), 20),
+        'time': np.tile(np.arange(20), n_windows),
+        'value': rng.random(20 * n_windows),
+    })
+
+def write_config(tmp_path, **settings):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"feature_extraction": {
+        "default_fc_parameters": "MinimalFCParameters",
+        "n_jobs": 0,
+        **settings,
+    }}))
+    return str(config_path)
+
+def test_cached_extraction_matches_uncached(tmp_path):
+    data = create_test_data()
+    expected = FeatureExtractor(write_config(tmp_path)).extract_features(data)
+
+    cached_extractor = FeatureExtractor(write_config(tmp_path, use_cache=True, cache_path=str(tmp_path / "features.sqlite")))
+    first = cached_extractor.extract_features(data)
+    assert cached_extractor.feature_cache.hits == 0
+
+    # Two known windows in a new order plus one unseen window
+    new_data = pd.concat([data[data['id'] == 3].assign(id=10),
+                          data[data['id'] == 1].assign(id=11),
+                          create_test_data(1, seed=1).assign(id=12)])
+    second = cached_extractor.extract_features(new_data)
+
+    pd.testing.assert_frame_equal(first, expected, check_names=False, check_index_type=False)
+    assert cached_extractor.feature_cache.hits == 2
+    assert list(second.index) == [10, 11, 12]
+    np.testing.assert_allclose(second.loc[10], expected.loc[3])
+    np.testing.assert_allclose(second.loc[11], expected.loc[1])
+
+def test_eviction_keeps_cache_below_limit(tmp_path):
+    row_bytes = 4 * 8
+    cache = FeatureCache(tmp_path / "features.sqlite", max_bytes=5 * row_bytes)
+    old_keys = [f"old_{i}" for i in range(5)]
+    new_keys = [f"new_{i}" for i in range(5)]
+    cache.store("settings", ["a", "b", "c", "d"], old_keys, np.ones((5, 4)))
+    cache.store("settings", ["a", "b", "c", "d"], new_keys, np.zeros((5, 4)))
+
+    assert cache.size() <= cache.max_bytes
+    _, rows = cache.lookup("settings", old_keys + new_keys)
+    assert set(rows) == set(new_keys)
@@ -3,10 +3,12 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import sys
+import json
+from tsfresh.utilities.distribution import MapDistributor
 
-sys.path.append(str(Path(__file__).resolve().parent.parent / "modules"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from feature_extractor import FeatureExtractor
+from modules.feature_extractor import FeatureExtractor
 
 def create_test_data():
     """Creates a sample DataFrame structured for tsfresh feature extraction."""
@@ -35,3 +37,46 @@ def test_extract_features():
     # - Ensuring no NaN values are present after imputation
 
 # To execute the test, use the command: pytest tests/test_feature_extractor.py
+
+def test_kind_to_fc_parameters_profile(tmp_path):
+    profile_path = tmp_path / "kind_to_fc_parameters.json"
+    selected_columns = ["value__mean", "value__maximum", "value__quantile__q_0.9"]
+    FeatureExtractor.save_kind_to_fc_parameters(selected_columns, str(profile_path))
+
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"feature_extraction": {
+        "default_fc_parameters": "kind_to_fc_parameters",
+        "kind_to_fc_parameters_path": str(profile_path),
+    }}))
+    feature_extractor = FeatureExtractor(str(config_path))
+    extracted_features = feature_extractor.extract_features(create_test_data())
+
+    assert sorted(extracted_features.columns) == sorted(selected_columns)
+
+def test_extract_features_batch_matches_single_files(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"feature_extraction": {
+        "default_fc_parameters": "MinimalFCParameters",
+        "n_jobs": 2,
+        "distributor": "multiprocessing",
+    }}))
+    feature_extractor = FeatureExtractor(str(config_path))
+    data = create_test_data()
+    frames = [data[data['id'] < 4], data[data['id'] >= 4]]
+
+    batched = feature_extractor.extract_features_batch(frames)
+
+    for frame, features in zip(frames, batched):
+        expected = feature_extractor.extract_features(frame)
+        pd.testing.assert_frame_equal(features, expected, check_names=False)
+
+def test_null_n_jobs_runs_sequentially(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"feature_extraction": {
+        "default_fc_parameters": "MinimalFCParameters",
+        "n_jobs": None,
+        "distributor": "multiprocessing",
+    }}))
+    feature_extractor = FeatureExtractor(str(config_path))
+    assert isinstance(feature_extractor.make_distributor(), MapDistributor)
+    assert len(feature_extractor.extract_features(create_test_data())) == 10
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from modules.labeller import Labeller
+from modules.signal_preprocessor import SignalPreprocessor
+
+def create_labeller(tmp_path, min_overlap=0.0, hop_length_ms=100):
+    preprocessor = SignalPreprocessor(window_length_ms=100, hop_length_ms=hop_length_ms)
+    labelling_config = {
+        'anomaly_intervals': {'experiment1_measurement_5': [{'start': 0.25, 'end': 0.4}, {'start': 0.9, 'end': 1.0}]},
+        'min_overlap': min_overlap,
+        'labels_path': str(tmp_path / 'labels.csv'),
+    }
+    return Labeller(labelling_config, preprocessor)
+
+def test_label_windows(tmp_path):
+    intervals = [{'start': 0.25, 'end': 0.4}, {'start': 0.9, 'end': 1.0}]
+    window_ids = np.arange(12)
+
+    # Windows touching an interval are anomalies, as with the former hardcoded time ranges
+    labels = create_labeller(tmp_path).label_windows(window_ids, intervals)
+    assert labels.tolist() == [0, 0, 1, 1, 1, 0, 0, 0, 0, 1, 1, 0]
+
+    # At least half of the window inside an interval
+    labels = create_labeller(tmp_path, min_overlap=0.5).label_windows(window_ids, intervals)
+    assert labels.tolist() == [0, 0, 1, 1, 0, 0, 0, 0, 0, 1, 0, 0]
+
+    # Overlapping windows with a 50 ms hop
+    labels = create_labeller(tmp_path, hop_length_ms=50).label_windows(np.arange(6), intervals)
+    assert labels.tolist() == [0, 0, 0, 0, 1, 1]
+
+def test_label_sidecar_roundtrip(tmp_path):
+    features = pd.DataFrame({'data_filtered__mean': np.arange(12, dtype=float)})
+    features.to_csv(tmp_path / 'experiment1_measurement_5.csv', index=False)
+
+    labeller = create_labeller(tmp_path)
+    labels = labeller.build_labels(tmp_path)
+    labeller.save_labels(labels)
+    labelled = Labeller.load_labelled_features(tmp_path, labeller.labels_path)
+
+    assert len(labels) == 12
+    assert labelled['data_filtered__mean'].tolist() == list(range(12))
+    assert labelled['label'].tolist() == labels['label'].tolist()
+    assert labelled.index.names == ['file', 'id']
@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyClassifier
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from modules.learner import Learner
+
+def create_training_set():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(120, 3)), columns=["a", "b", "c"])
+    y = (X["a"] > 0).astype(int).to_numpy()
+    groups = np.repeat(["m1", "m2", "m3", "m4"], 30)
+    return X, y, groups
+
+def test_grouped_cross_validation_keeps_groups_together():
+    X, y, groups = create_training_set()
+    learner = Learner(config={"name": "decision_tree", "max_depth": 3})
+    result = learner.cross_validation(X, y, groups=groups, cv=10, n_jobs=2)
+
+    # At most one fold per group
+    assert len(result["scores"]) == 4
+    assert result["predictions"].shape == y.shape
+    assert (result["predictions"] == y).mean() > 0.8
+
+def test_cross_validation_cache(tmp_path, monkeypatch):
+    X, y, _ = create_training_set()
+    learner = Learner(config={"name": "random_forest", "n_estimators": 10, "random_state": 0})
+    first = learner.cross_validation(X, y, cv=3, cache_directory=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 3
+
+    # Cached folds are not fitted again
+    monkeypatch.setattr("modules.learner.clone", lambda model: (_ for _ in ()).throw(AssertionError("refit")))
+    second = learner.cross_validation(X, y, cv=3, cache_directory=str(tmp_path))
+    np.testing.assert_array_equal(first["scores"], second["scores"])
+    np.testing.assert_array_equal(first["probabilities"], second["probabilities"])
+
+def test_fold_with_a_single_training_class_is_rejected():
+    X, _, _ = create_training_set()
+    y = np.repeat([0, 1], 60)
+    groups = np.repeat(["m1", "m2"], 60)
+    learner = Learner(config={"name": "decision_tree", "max_depth": 3})
+    with pytest.raises(ValueError, match="only contains class"):
+        learner.cross_validation(X, y, groups=groups, cv=10)
+
+def test_cross_validation_oversamples_only_the_training_part_of_every_fold():
+    X, _, _ = create_training_set()
+    y = np.r_[np.ones(20, dtype=int), np.zeros(100, dtype=int)]
+    learner = Learner(config={"name": "decision_tree", "max_depth": 3})
+    learner.model = DummyClassifier(strategy="prior")
+
+    plain = learner.cross_validation(X, y, cv=5)
+    oversampled = learner.cross_validation(X, y, cv=5, oversample=True)
+
+    # Every original row is scored once; the fold models see balanced classes
+    assert oversampled["probabilities"].shape == y.shape
+    np.testing.assert_allclose(plain["probabilities"], 20 / 120)
+    np.testing.assert_allclose(oversampled["probabilities"], 0.5)
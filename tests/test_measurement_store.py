@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from modules.measurement_store import MeasurementStore
+
+def create_test_frame():
+    """Creates a combined frame shaped like DataLoader.load_experiment_data output."""
+    parts = []
+    for experiment, measurement, length in [("experiment1", "measurement_1", 4),
+                                            ("experiment1", "measurement_2", 3),
+                                            ("experiment2", "measurement_1", 5)]:
+        parts.append(pd.DataFrame({
+            "data": np.random.rand(length),
+            "experiment": experiment,
+            "measurement": measurement,
+        }))
+    data = pd.concat(parts, ignore_index=True)
+    data.insert(0, "time", np.arange(1, len(data) + 1) / 10e3)
+    return data
+
+def test_load_single_measurement_matches_filtered_frame(tmp_path):
+    full_data = create_test_frame()
+    store = MeasurementStore(tmp_path / "store")
+    store.write_frame(full_data)
+
+    # A fresh instance reads the index from disk
+    store = MeasurementStore(tmp_path / "store")
+    loaded = store.load("experiment1", "measurement_2")
+    expected = full_data[(full_data["experiment"] == "experiment1") &
+                         (full_data["measurement"] == "measurement_2")].reset_index(drop=True)
+    pd.testing.assert_frame_equal(loaded, expected)
+
+    experiment = store.load("experiment1")
+    assert len(experiment) == 7
+    assert isinstance(store.load_values("experiment2", "measurement_1"), np.memmap)
+
+def test_missing_measurement(tmp_path):
+    store = MeasurementStore(tmp_path / "store")
+    store.write_frame(create_test_frame())
+    assert store.load("experiment3").empty
+    with pytest.raises(KeyError):
+        store.load_values("experiment1", "measurement_9")
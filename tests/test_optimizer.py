@@ -0,0 +1,147 @@
+import gc
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from modules.optimizer import RandomForestOptimizer
+
+def create_config(**tuning):
+    return {
+        "tuning": {"cv": 3, "scoring": "accuracy", "n_jobs": 1, **tuning},
+        "param_grid": {"criterion": ["gini", "entropy"], "min_samples_leaf": [1, 5, 30], "n_estimators": [5, 10, 20]},
+        "criterion": "gini", "min_samples_leaf": 1, "min_samples_split": 2, "n_estimators": 2,
+        "oob_score": False, "random_state": 0, "n_jobs": 1,
+    }
+
+def create_training_set():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(90, 3)), columns=["a", "b", "c"])
+    y = (X["a"] + 0.3 * rng.normal(size=90) > 0).astype(int).to_numpy()
+    return X, y
+
+def test_halving_search_grows_only_the_best_candidates():
+    X, y = create_training_set()
+    optimizer = RandomForestOptimizer(create_config(strategy="halving", factor=3))
+    optimizer.hyper_parameter_tuning(X, y)
+
+    rungs = [params["n_estimators"] for params, _ in optimizer.results_]
+    # 6 candidates -> 2 -> 1
+    assert [rungs.count(n) for n in (5, 10, 20)] == [6, 2, 1]
+    assert len(optimizer.trials) == 3 * len(optimizer.results_)
+    assert optimizer.best_params_ == optimizer.results_[-1][0]
+    assert optimizer.best_estimator_.n_estimators == optimizer.best_params_["n_estimators"]
+
+@pytest.mark.parametrize("last_rung, expected", [(20, (20, 0.6)), (10, (10, 0.7))])
+def test_halving_picks_the_best_candidate_of_the_last_completed_rung(last_rung, expected):
+    X, y = create_training_set()
+    optimizer = RandomForestOptimizer(create_config(strategy="halving", factor=3))
+    # A peaks on the first rung, B wins the later ones
+    scores = {("gini", 1): {5: 0.95, 10: 0.5}, ("gini", 5): {5: 0.8, 10: 0.7, 20: 0.6}}
+    def grow(forests, params, n_estimators, *args, **kwargs):
+        if n_estimators > last_rung:
+            return None
+        return scores.get((params["criterion"], params["min_samples_leaf"]), {}).get(n_estimators, 0.1)
+    optimizer.grow = grow
+    optimizer.budgeted_search(X, y)
+
+    assert (optimizer.best_params_["n_estimators"], optimizer.best_score_) == expected
+    assert optimizer.best_params_["min_samples_leaf"] == 5
+
+def test_halving_builds_forests_lazily_and_frees_eliminated_candidates():
+    X, y = create_training_set()
+    optimizer = RandomForestOptimizer(create_config(strategy="halving", factor=3))
+    alive = []
+    original_grow = optimizer.grow
+    def grow(forests, params, n_estimators, *args, **kwargs):
+        gc.collect()
+        fold_forests = [obj for obj in gc.get_objects() if isinstance(obj, RandomForestClassifier) and obj.warm_start]
+        alive.append((n_estimators, len(fold_forests)))
+        return original_grow(forests, params, n_estimators, *args, **kwargs)
+    optimizer.grow = grow
+    optimizer.budgeted_search(X, y)
+
+    # 3 folds per candidate: one more candidate per evaluation on the first rung, then only the survivors
+    assert [count for n, count in alive if n == 5] == [3, 6, 9, 12, 15, 18]
+    assert [count for n, count in alive if n == 10] == [6, 6]
+    assert [count for n, count in alive if n == 20] == [3]
+
+def test_warm_start_reuses_the_trees_of_the_previous_rung(monkeypatch):
+    X, y = create_training_set()
+    optimizer = RandomForestOptimizer(create_config(strategy="random", n_candidates=1))
+    fitted = []
+    original_fit = type(optimizer.model).fit
+    def fit(forest, *args, **kwargs):
+        n_before = len(getattr(forest, "estimators_", []))
+        result = original_fit(forest, *args, **kwargs)
+        fitted.append(len(forest.estimators_) - n_before)
+        return result
+    monkeypatch.setattr(type(optimizer.model), "fit", fit)
+    optimizer.budgeted_search(X, y)
+
+    # 3 folds grown to 5, 10 and 20 trees, then the refit of the best configuration
+    assert fitted[:9] == [5, 5, 5, 5, 5, 5, 10, 10, 10]
+    assert len(optimizer.results_) == 3
+
+def test_time_budget_stops_the_search():
+    X, y = create_training_set()
+    optimizer = RandomForestOptimizer(create_config(strategy="random", time_budget_s=0.0))
+    with pytest.raises(RuntimeError):
+        optimizer.hyper_parameter_tuning(X, y)
+
+def test_interrupted_search_resumes_from_the_trials_file(tmp_path, monkeypatch):
+    X, y = create_training_set()
+    trials_path = tmp_path / "trials.jsonl"
+    config = create_config(strategy="halving", factor=3, trials_path=str(trials_path))
+    complete = RandomForestOptimizer(config)
+    complete.hyper_parameter_tuning(X, y)
+    lines = trials_path.read_text().splitlines()
+    assert len(lines) == len(complete.trials)
+
+    # Keep the first 10 trials plus a line cut off by the interruption
+    trials_path.write_text("\n".join(lines[:10]) + "\n" + lines[10][:20])
+    resumed = RandomForestOptimizer(config)
+    resumed.hyper_parameter_tuning(X, y)
+
+    assert len(resumed.trials) == len(complete.trials) - 10
+    assert resumed.best_params_ == complete.best_params_
+    assert resumed.best_score_ == complete.best_score_
+    assert len(trials_path.read_text().splitlines()) == len(lines) + 1
+    # Forests that skipped a rung catch up with the same trees
+    assert [trial["score"] for trial in resumed.trials] == [trial["score"] for trial in complete.trials[10:]]
+
+    # Changed data starts a fresh search
+    fresh = RandomForestOptimizer(config)
+    fresh.hyper_parameter_tuning(X * 2, y)
+    assert len(fresh.trials) == len(complete.trials)
+
+def test_parallel_folds_match_sequential_folds():
+    X, y = create_training_set()
+    sequential = RandomForestOptimizer(create_config(strategy="halving", n_jobs=1))
+    sequential.hyper_parameter_tuning(X, y)
+    parallel = RandomForestOptimizer(create_config(strategy="halving", n_jobs=3))
+    parallel.hyper_parameter_tuning(X, y)
+
+    assert parallel.fold_jobs(3)[0] == 3
+    assert parallel.results_ == sequential.results_
+
+def test_budget_is_checked_before_every_fold():
+    X, y = create_training_set()
+    optimizer = RandomForestOptimizer(create_config())
+    y = np.asarray(y)
+    folds = [(clone(optimizer.model).set_params(warm_start=True), np.arange(60), np.arange(60, 90))] * 3
+
+    def slow_scorer(forest, X_validation, y_validation):
+        time.sleep(0.2)
+        return 1.0
+
+    # The first fold starts within the budget, the others would start after it
+    score = optimizer.grow(folds, {}, 5, X, y, slow_scorer, deadline=time.perf_counter() + 0.1)
+    assert score is None
+    assert len(optimizer.trials) == 1
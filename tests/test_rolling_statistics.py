@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from modules.rolling_statistics import ROLLING_FEATURES, RollingStatistics
+from modules.signal_preprocessor import SignalPreprocessor
+from modules.window_features import WindowFeatureCalculator
+
+def test_rolling_statistics_match_window_matrix():
+    preprocessor = SignalPreprocessor(window_length_ms=10, hop_length_ms=3, sampling_rate_hz=1000, continuous_filter=True)
+    rng = np.random.default_rng(3)
+    signal = preprocessor.filter_signal(5 + rng.normal(0, 1, 503))
+
+    rolling = RollingStatistics.from_preprocessor(preprocessor).compute(signal)
+    windows = preprocessor.window_matrix(signal)
+    expected = WindowFeatureCalculator({name: None for name in ROLLING_FEATURES}).extract(windows)
+
+    assert len(rolling) == preprocessor.count_windows(len(signal))
+    np.testing.assert_allclose(rolling.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
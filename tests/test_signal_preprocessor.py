@@ -33,5 +33,122 @@ def test_preprocess():
     preprocessed_windows = sp.preprocess(df)
     assert len(preprocessed_windows) == 1, "Preprocess should segment data into 1 window for 1000 data points"
 
+def test_window_matrix_is_view():
+    sp = SignalPreprocessor(window_length_ms=100, sampling_rate_hz=10000)
+    signal = np.random.rand(10500)
+    windows = sp.window_matrix(signal)
+    assert windows.shape == (10, 1000)
+    assert np.shares_memory(windows, signal), "Full windows should be a view on the signal"
+    np.testing.assert_array_equal(windows[3], signal[3000:4000])
+
+    windows, remainder = sp.window_matrix(signal, partial='separate')
+    np.testing.assert_array_equal(remainder, signal[10000:])
+
+    padded = sp.window_matrix(signal, partial='pad')
+    assert padded.shape == (11, 1000)
+    np.testing.assert_array_equal(padded[-1, :500], signal[10000:])
+    assert not padded[-1, 500:].any()
+
+def test_filter_windows_matches_per_window_filter():
+    sp = SignalPreprocessor(window_length_ms=100, sampling_rate_hz=10000, cutoff_hz=40)
+    windows = sp.window_matrix(np.random.rand(5000))
+    filtered = sp.filter_windows(windows)
+    expected = np.vstack([sp.butter_lowpass_filter(window) for window in windows])
+    np.testing.assert_allclose(filtered, expected)
+    assert sp.cutoff_hz == 40, "Filtering must not change the configured cutoff"
+
+def test_streaming_matches_whole_measurement():
+    sp = SignalPreprocessor(window_length_ms=100, sampling_rate_hz=10000, continuous_filter=True)
+    signal = np.random.rand(12345)
+    streaming = sp.streaming()
+
+    chunk_sizes = [1, 999, 4000, 7, 7338]
+    bounds = np.cumsum([0] + chunk_sizes)
+    filtered = np.concatenate([streaming.filter(signal[start:stop]) for start, stop in zip(bounds[:-1], bounds[1:])])
+    np.testing.assert_array_equal(filtered, sp.butter_lowpass_filter(signal))
+
+    streaming.reset()
+    windows = np.vstack([streaming.push(signal[start:stop]) for start, stop in zip(bounds[:-1], bounds[1:])])
+    df = pd.DataFrame({'time': np.arange(len(signal)) / 10000, 'data': signal})
+    _, expected_windows, _, _ = sp.preprocess_matrix(df)
+    np.testing.assert_array_equal(windows, expected_windows)
+
+def test_overlapping_windows_with_hop():
+    sp = SignalPreprocessor(window_length_ms=100, sampling_rate_hz=10000, hop_length_ms=10)
+    signal = np.arange(3050, dtype=float)
+    windows, remainder = sp.window_matrix(signal, partial='separate')
+    # Window starts at 0, 100, ..., 2000 samples
+    assert windows.shape == (21, 1000)
+    assert np.shares_memory(windows, signal), "Overlapping windows should not duplicate samples"
+    np.testing.assert_array_equal(windows[:, 0], np.arange(0, 2001, 100))
+    np.testing.assert_array_equal(remainder, signal[2100:])
+    np.testing.assert_allclose(sp.window_start_times([0, 1, 20]), [0.0, 0.01, 0.2])
+
+    df = pd.DataFrame({'time': signal / 10000, 'data': np.random.rand(len(signal))})
+    preprocessed_windows = sp.preprocess(df)
+    assert [window['id'].iloc[0] for window in preprocessed_windows] == list(range(22))
+
+def test_overlapping_windows_without_uncovered_samples_have_no_partial_window():
+    sp = SignalPreprocessor(window_length_ms=100, sampling_rate_hz=10000, hop_length_ms=10)
+    # Window 10 (samples 1000-1999) already covers the end of the signal
+    windows, remainder = sp.window_matrix(np.arange(2000, dtype=float), partial='separate')
+    assert windows.shape == (11, 1000)
+    assert len(remainder) == 0
+
+    df = pd.DataFrame({'time': np.arange(2000) / 10000, 'data': np.random.rand(2000)})
+    assert len(sp.preprocess(df)) == 11
+
+    # One uncovered sample starts a partial window at the next hop
+    windows, remainder = sp.window_matrix(np.arange(2001, dtype=float), partial='separate')
+    assert len(windows) == 11
+    np.testing.assert_array_equal(remainder, np.arange(1100, 2001))
+
+def test_streaming_overlapping_windows():
+    sp = SignalPreprocessor(window_length_ms=100, sampling_rate_hz=10000, hop_length_ms=10)
+    signal = np.random.rand(2000)
+    streaming = sp.streaming()
+    windows = np.vstack([streaming.push(signal[start:start + 300]) for start in range(0, 2000, 300)])
+    np.testing.assert_array_equal(windows, sp.window_matrix(sp.butter_lowpass_filter(signal)))
+
+def test_decimation_after_lowpass():
+    sp = SignalPreprocessor(window_length_ms=100, sampling_rate_hz=10000, cutoff_hz=40, decimation_rate_hz='auto')
+    assert sp.output_rate_hz == 100
+    assert sp.window_size_points == 10
+
+    t = np.arange(20000) / 10000
+    df = pd.DataFrame({'time': t, 'data': np.sin(2*np.pi*2*t) + np.sin(2*np.pi*500*t)})
+    time_windows, filtered_windows, time_tail, _ = sp.preprocess_matrix(df)
+    assert filtered_windows.shape == (20, 10)
+    assert len(time_tail) == 0
+    np.testing.assert_allclose(time_windows[1], np.round(np.arange(10, 20) / 100, 4))
+    # The 2 Hz component survives, the 500 Hz component is removed
+    assert 0.5 < np.std(filtered_windows[5:]) * np.sqrt(2) < 1.1
+
+def test_binary_output_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sp = SignalPreprocessor(window_length_ms=100, sampling_rate_hz=10000, hop_length_ms=50, output_format='npy')
+    df = pd.DataFrame({'time': np.arange(3200) / 10000, 'data': np.random.rand(3200)})
+    time_windows, filtered_windows, time_tail, filtered_tail = sp.preprocess_matrix(df)
+    sp.save_preprocessed_matrix(time_windows, filtered_windows, 'experiment1', 'measurement_1',
+                                time_tail=time_tail, filtered_tail=filtered_tail)
+
+    windows, metadata = SignalPreprocessor.load_preprocessed_matrix(tmp_path / '.data/preprocessed/experiment1_measurement_1.npy')
+    assert isinstance(windows, np.memmap)
+    assert metadata['n_windows'] == 6 and metadata['partial_window_points'] == 700
+    assert metadata['hop_size_points'] == 500
+    np.testing.assert_array_equal(windows[:5], filtered_windows)
+
+    # Blocks are views of the memory map; the partial window comes last without its padding
+    blocks = list(SignalPreprocessor.iter_window_blocks(windows, metadata, block_windows=2))
+    assert [(first_window, block.shape) for first_window, block in blocks] == [(0, (2, 1000)), (2, (2, 1000)), (4, (1, 1000)), (5, (1, 700))]
+    assert isinstance(blocks[0][1], np.memmap)
+    np.testing.assert_array_equal(blocks[-1][1][0], filtered_tail)
+
+    # The long format matches the CSV output including the trailing partial window
+    long_format = pd.concat([SignalPreprocessor.windows_to_long_format(block, metadata, first_window)
+                             for first_window, block in blocks], ignore_index=True)
+    expected = pd.concat(sp.preprocess(df), ignore_index=True)
+    pd.testing.assert_frame_equal(long_format, expected, check_dtype=False)
+
 
 # To run these tests, use the command: pytest test_signal_preprocessor.py
@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.utils import check_array
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from modules.training_scheduler import TrainingScheduler, memmap_dtype, split_core_budget
+
+ALGORITHMS = {
+    "random_forest": {"name": "random_forest", "n_estimators": 20, "random_state": 41},
+    "decision_tree": {"name": "decision_tree", "max_depth": 3},
+    "k_nearest_neighbors": {"name": "k_nearest_neighbors", "n_neighbors": 3},
+    "optimizer": {"name": "optimizer"},
+}
+
+def test_split_core_budget():
+    configs = {name: config for name, config in ALGORITHMS.items() if name != "optimizer"}
+    assert split_core_budget(configs, 8) == {"random_forest": 6, "decision_tree": 1, "k_nearest_neighbors": 1}
+    assert split_core_budget(configs, 2) == {"random_forest": 1, "decision_tree": 1, "k_nearest_neighbors": 1}
+
+def test_tree_learners_share_a_float32_memmap(tmp_path):
+    assert memmap_dtype(ALGORITHMS["random_forest"]) == memmap_dtype(ALGORITHMS["decision_tree"]) == np.float32
+    assert memmap_dtype(ALGORITHMS["k_nearest_neighbors"]) == np.float64
+
+    # The trees validate the float32 memory map to float32 without copying it
+    X_path = tmp_path / "X_train.npy"
+    np.save(X_path, np.random.default_rng(0).normal(size=(10, 2)).astype(np.float32))
+    X_train = np.load(X_path, mmap_mode='r')
+    assert np.shares_memory(check_array(X_train, dtype=np.float32), X_train)
+
+def test_fit_all(tmp_path):
+    rng = np.random.default_rng(0)
+    X_train = pd.DataFrame(rng.normal(size=(200, 4)), columns=["a", "b", "c", "d"])
+    y_train = (X_train["a"] > 0).astype(int)
+
+    scheduler = TrainingScheduler(ALGORITHMS, n_cores=4, memmap_directory=str(tmp_path))
+    learners = scheduler.fit_all(X_train, y_train)
+
+    assert set(learners) == {"random_forest", "decision_tree", "k_nearest_neighbors"}
+    assert learners["random_forest"].model.n_jobs == 2
+    assert list(learners["random_forest"].model.feature_names_in_) == ["a", "b", "c", "d"]
+    assert (learners["decision_tree"].predict(X_train) == y_train).mean() > 0.9
+    assert set(scheduler.fit_times) == set(learners)
+    assert not list(tmp_path.iterdir())
+
+def test_fewer_cores_than_learners_stay_within_budget(tmp_path):
+    rng = np.random.default_rng(0)
+    X_train = rng.normal(size=(100, 3))
+    y_train = (X_train[:, 0] > 0).astype(int)
+
+    scheduler = TrainingScheduler(ALGORITHMS, n_cores=2, memmap_directory=str(tmp_path))
+    budget = split_core_budget(scheduler.configs, 2)
+    # At most two learners with one core each run at the same time
+    assert scheduler.concurrent_learners() == 2
+    assert sum(sorted(budget.values(), reverse=True)[:scheduler.concurrent_learners()]) <= 2
+
+    learners = scheduler.fit_all(X_train, y_train)
+    assert set(learners) == {"random_forest", "decision_tree", "k_nearest_neighbors"}
+    assert learners["random_forest"].model.n_jobs == 1
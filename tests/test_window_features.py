@@ -0,0 +1,106 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from tsfresh import extract_features
+from tsfresh.feature_extraction import ComprehensiveFCParameters
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.feature_extractor import FeatureExtractor
+from modules.window_features import (CALCULATORS, NATIVE_ONLY_CALCULATORS, SPECTRAL_CALCULATORS, WindowFeatureCalculator,
+                                     band_power_parameters, supported_fc_parameters)
+
+def create_windows(n_windows=12, window_length=200):
+    """Noisy sine windows plus a constant and a zero window to cover the NaN branches."""
+    rng = np.random.default_rng(0)
+    t = np.arange(window_length) / 1000
+    windows = np.sin(2 * np.pi * rng.uniform(5, 40, (n_windows, 1)) * t) + rng.normal(0, 0.3, (n_windows, window_length))
+    windows[-2] = 1.5
+    windows[-1] = 0.0
+    return windows
+
+def tsfresh_features(windows, fc_parameters, kind='data_filtered'):
+    n_windows, window_length = windows.shape
+    data = pd.DataFrame({
+        'id': np.repeat(np.arange(n_windows), window_length),
+        'time': np.tile(np.arange(window_length), n_windows),
+        kind: windows.ravel(),
+    })
+    return extract_features(data, column_id='id', column_sort='time',
+                            default_fc_parameters=fc_parameters, disable_progressbar=True, n_jobs=0)
+
+@pytest.mark.parametrize("window_length", [200, 7])
+def test_parity_with_tsfresh(window_length):
+    windows = create_windows(window_length=window_length)
+    fc_parameters = supported_fc_parameters(ComprehensiveFCParameters())
+    assert set(fc_parameters) == (set(CALCULATORS) | set(SPECTRAL_CALCULATORS)) - set(NATIVE_ONLY_CALCULATORS)
+
+    expected = tsfresh_features(windows, fc_parameters)
+    native = WindowFeatureCalculator(fc_parameters).extract(windows)
+
+    assert list(native.columns) == list(expected.columns)
+    np.testing.assert_allclose(native.to_numpy(), expected.to_numpy(dtype=float), rtol=1e-7, atol=1e-9, equal_nan=True)
+
+def test_unsupported_calculator_is_rejected():
+    with pytest.raises(ValueError):
+        WindowFeatureCalculator({"sample_entropy": None})
+
+def test_native_engine_in_feature_extractor(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"feature_extraction": {
+        "default_fc_parameters": "MinimalFCParameters",
+        "engine": "native",
+    }}))
+    windows = create_windows()
+    features = FeatureExtractor(str(config_path)).extract_window_features(windows)
+
+    assert len(features) == len(windows)
+    assert "data_filtered__mean" in features.columns
+    assert not features.isna().any().any()
+
+def test_block_extraction_matches_whole_matrix(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"feature_extraction": {
+        "default_fc_parameters": "MinimalFCParameters",
+        "engine": "native",
+    }}))
+    extractor = FeatureExtractor(str(config_path))
+    windows = create_windows()
+    blocks = [(start, windows[start:start + 5]) for start in range(0, len(windows), 5)]
+
+    pd.testing.assert_frame_equal(extractor.extract_window_blocks(blocks),
+                                  extractor.extract_window_features(windows), check_index_type=False)
+
+def test_band_power():
+    sampling_rate_hz = 1000
+    t = np.arange(1000) / sampling_rate_hz
+    windows = np.vstack([2 * np.sin(2 * np.pi * 20 * t), 0.5 + np.sin(2 * np.pi * 35 * t)])
+    calculator = WindowFeatureCalculator(band_power_parameters([0, 10, 30, 501]), sampling_rate_hz)
+    features = calculator.extract(windows)
+
+    absolute = features.filter(like="__band_power__").to_numpy()
+    relative = features.filter(like="__relative_band_power__").to_numpy()
+    # Parseval: the bands cover the whole spectrum, so they add up to the mean square
+    np.testing.assert_allclose(absolute.sum(axis=1), (windows ** 2).mean(axis=1))
+    np.testing.assert_allclose(relative.sum(axis=1), 1.0)
+    np.testing.assert_allclose(features["data_filtered__band_power__f_high_30__f_low_10"], [2.0, 0.0], atol=1e-12)
+    np.testing.assert_allclose(features["data_filtered__band_power__f_high_10__f_low_0"], [0.0, 0.25], atol=1e-12)
+
+def test_native_only_profile_roundtrip(tmp_path):
+    profile_path = tmp_path / "kind_to_fc_parameters.json"
+    columns = ["data_filtered__mean", "data_filtered__band_power__f_high_20__f_low_10"]
+    FeatureExtractor.save_kind_to_fc_parameters(columns, str(profile_path))
+
+    config_path = tmp_path / "config.json"
+    settings = {"default_fc_parameters": "kind_to_fc_parameters", "kind_to_fc_parameters_path": str(profile_path)}
+    config_path.write_text(json.dumps({"feature_extraction": {**settings, "engine": "native"}}))
+    features = FeatureExtractor(str(config_path)).extract_window_features(create_windows(), sampling_rate_hz=1000)
+    assert sorted(features.columns) == sorted(columns)
+
+    config_path.write_text(json.dumps({"feature_extraction": {**settings, "engine": "tsfresh"}}))
+    with pytest.raises(ValueError):
+        FeatureExtractor(str(config_path))